@@ -1,9 +1,35 @@
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
-from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import hashlib
 import json
+import secrets
+import time
+import xxhash
+
+# Dedup key algorithm. Rows written before the switch carry an MD5 key
+# and no "hash_algo" tag in metadata.
+HASH_ALGORITHM = "xxh3_64"
+
+# Preview length persisted alongside content (list views never read full content)
+SNIPPET_LENGTH = 64
+
+def content_hash(content: str) -> str:
+    """Fast non-cryptographic dedup key for content"""
+    return xxhash.xxh3_64_hexdigest(content.encode('utf-8'))
+
+def legacy_content_hash(content: str) -> str:
+    """MD5 dedup key used by rows created before xxh3"""
+    return hashlib.md5(content.encode()).hexdigest()
+
+@lru_cache(maxsize=1)
+def _now_for_tick(tick: int) -> datetime:
+    return datetime.now()
+
+def cached_now() -> datetime:
+    """datetime.now() memoized per monotonic second (hot-path timestamps)"""
+    return _now_for_tick(int(time.monotonic()))
 
 class Link(BaseModel):
     """Directed edge between abstractions"""
@@ -17,12 +43,14 @@ class Abstraction(BaseModel):
     Represents a compressed concept or pattern.
     """
     # Identity & Versioning
-    id: str = Field(default_factory=lambda: str(uuid4()))
+    # 128-bit random hex; ~5x cheaper than str(uuid4()) and prefixes stay distinct for id[:8] logs
+    id: str = Field(default_factory=lambda: secrets.token_hex(16))
     version: int = 1
     
     # Core Content
     content: str
     embedding_hash: str  # For quick duplicate detection
+    content_snippet: Optional[str] = None  # content[:SNIPPET_LENGTH], set by update_hash()
     cluster_id: Optional[str] = None
     
     # Extensible Metadata (Source, Domain, etc.)
@@ -64,11 +92,14 @@ class Abstraction(BaseModel):
     
     def update_hash(self):
         """Update embedding hash based on content"""
-        self.embedding_hash = hashlib.md5(self.content.encode()).hexdigest()
+        self.embedding_hash = content_hash(self.content)
+        self.content_snippet = self.content[:SNIPPET_LENGTH]
+        self.metadata["hash_algo"] = HASH_ALGORITHM
+
+    def touch(self, now: Optional[datetime] = None):
+        """Update last_used timestamp (bulk callers pass one shared `now`)"""
+        self.last_used = now or cached_now()
 
-    def touch(self):
-        """Update last_used timestamp"""
-        self.last_used = datetime.now()
-        
-    class Config:
-        validate_assignment = True
+    # Counters/timestamps are mutated on every retrieval; re-running the full
+    # validator per assignment is pure overhead. Callers assign typed values.
+    model_config = ConfigDict(validate_assignment=False)
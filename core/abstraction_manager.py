@@ -1,10 +1,11 @@
 from typing import List, Optional, Tuple
-from core.abstraction import Abstraction
+from core.abstraction import Abstraction, HASH_ALGORITHM, SNIPPET_LENGTH, content_hash, legacy_content_hash
 from core.storage import EngramStorage
 from core.embedding import EmbeddingHandler
 from core.quality import calculate_quality_score
 from utils import config
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +22,15 @@ class AbstractionManager:
         Returns (Abstraction, created: bool).
         If duplicate content exists, returns (existing, False).
         """
-        # 1. Create temporary object to get hash
-        temp = Abstraction(content=content, embedding_hash="")
-        temp.update_hash()
+        # 1. Hash directly (no throwaway model instance to validate)
+        embedding_hash = content_hash(content)
         
         # 2. Check for exact duplicate via hash (Duplicate Check)
         # Check if hash exists in DB metadata (optimization)
-        existing = self.storage.get_abstraction_by_hash(temp.embedding_hash)
+        # Legacy MD5 key keeps pre-xxh3 rows deduplicating
+        existing = self.storage.get_abstraction_by_hash(
+            embedding_hash, legacy_hash=legacy_content_hash(content)
+        )
         if existing:
             logger.info(f"Duplicate abstraction found: {existing.id[:8]}")
             return existing, False
@@ -38,8 +41,9 @@ class AbstractionManager:
         # 4. Create final object with DEFAULT VALUES
         abs_obj = Abstraction(
             content=content,
-            embedding_hash=temp.embedding_hash,
-            metadata=metadata or {},
+            embedding_hash=embedding_hash,
+            content_snippet=content[:SNIPPET_LENGTH],
+            metadata={**(metadata or {}), "hash_algo": HASH_ALGORITHM},
             compression_ratio=1.0,  # Default
             accuracy_preserved=1.0, # Default
             decay_score=0.0,        # Fresh
@@ -82,6 +86,12 @@ class AbstractionManager:
         if not abs_obj:
             return None
             
+        # Unchanged content: skip re-embedding and re-persisting (mirrors the
+        # exact-duplicate short-circuit in create_abstraction)
+        if content_hash(content) == abs_obj.embedding_hash:
+            logger.info(f"Abstraction {abs_id[:8]} unchanged, skipping re-embed")
+            return abs_obj
+            
         # 1. Update Content & Version
         abs_obj.content = content
         abs_obj.update_hash()
@@ -96,3 +106,9 @@ class AbstractionManager:
         logger.info(f"Updated abstraction {abs_id[:8]} to v{abs_obj.version}")
         
         return abs_obj
+
+
+@lru_cache(maxsize=1)
+def get_abstraction_manager() -> AbstractionManager:
+    """Process-wide shared AbstractionManager"""
+    return AbstractionManager()
@@ -1,7 +1,6 @@
 import logging
 from typing import List
-from core.abstraction_manager import AbstractionManager
-from integration.ollama_client import OllamaClient
+from integration.ollama_client import get_ollama_client
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +10,7 @@ class SalienceDetector:
     Rates emotional importance during ingestion.
     """
     def __init__(self):
-        self.llm = OllamaClient()
+        self.llm = get_ollama_client()
         
     def detect(self, content: str) -> float:
         """
@@ -32,7 +31,7 @@ class QueryExpander:
     Improves recall by searching multiple variants.
     """
     def __init__(self):
-        self.llm = OllamaClient()
+        self.llm = get_ollama_client()
         
     def expand(self, query: str) -> List[str]:
         """Generate 3 alternative query phrasings"""
@@ -1,17 +1,20 @@
 
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import json
 import asyncio
+import zlib
+import numpy as np
+from functools import lru_cache
 from typing import List
 import logging
 from pathlib import Path
 
 # Engram Core
-from core.abstraction_manager import AbstractionManager
+from core.abstraction_manager import get_abstraction_manager
 from core.router import ClusterCentroidManager
 from utils import config
 
@@ -19,7 +22,7 @@ from utils import config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("VisualCortex")
 
-app = FastAPI(title="Engram Visual Cortex")
+app = FastAPI(title="Engram Visual Cortex", default_response_class=ORJSONResponse)
 
 # Allow CORS for development
 app.add_middleware(
@@ -31,7 +34,7 @@ app.add_middleware(
 )
 
 # Initialize Core Systems
-manager = AbstractionManager()
+manager = get_abstraction_manager()
 centroid_mgr = ClusterCentroidManager()
 
 # WebSocket Manager
@@ -44,30 +47,43 @@ class ConnectionManager:
         self.active_connections.append(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        # May already have been pruned by a failed broadcast
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        # Send concurrently: latency is the slowest client, not the sum
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(c.send_text(message) for c in connections), return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Dropping websocket after failed send: {result}")
+                self.disconnect(connection)
 
 ws_manager = ConnectionManager()
 
+@lru_cache(maxsize=4096)
+def _cluster_color(cluster_id: str) -> str:
+    """Stable per-cluster hue (crc32, unlike hash(), survives restarts)"""
+    return f"hsl({zlib.crc32(cluster_id.encode()) % 360}, 70%, 50%)"
+
 @app.get("/api/clusters")
 def get_clusters():
     """Get all cluster centroids (Galaxies)"""
     centroids = centroid_mgr.get_all_centroids()
+    if not centroids:
+        return []
     # Format for UI: {id, vector, size}
     # For now, size is just 1.0, later we can count members
-    data = []
-    for c_id, vec in centroids.items():
-        data.append({
-            "id": c_id,
-            "x": float(vec[0]) * 10, # Project to 3D roughly
-            "y": float(vec[1]) * 10,
-            "z": float(vec[2]) * 10,
-            "color": f"hsl({hash(c_id) % 360}, 70%, 50%)"
-        })
-    return data
+    ids = list(centroids.keys())
+    # Project to 3D roughly: one vectorized op, one tolist() conversion
+    xyz = (np.stack([centroids[c_id][:3] for c_id in ids]) * 10.0).tolist()
+    return [
+        {"id": c_id, "x": x, "y": y, "z": z, "color": _cluster_color(c_id)}
+        for c_id, (x, y, z) in zip(ids, xyz)
+    ]
 
 @app.get("/api/abstractions")
 def get_abstractions():
@@ -75,27 +91,28 @@ def get_abstractions():
     # This is expensive, so limit to 500 for demo
     # In V2 we need a proper DB query for basic metadata only
     # Getting from chroma is hard to iterate, so let's use SQLite
-    cursor = manager.storage.conn.execute("SELECT id, cluster_id, content, quality_score FROM abstractions ORDER BY last_used DESC LIMIT 500")
-    rows = cursor.fetchall()
+    manager.storage.flush_metrics()  # Sort on current last_used, not the write-back buffer
+    cursor = manager.storage.conn.execute("SELECT id, cluster_id, content_snippet, quality_score FROM abstractions ORDER BY last_used DESC LIMIT 500")
     
-    nodes = []
-    for row in rows:
-        r = dict(row)
-        nodes.append({
-            "id": r["id"],
-            "group": r["cluster_id"] or "noise",
-            "label": r["content"][:30] + "...",
-            "val": r["quality_score"], # Size
-        })
-    return nodes
+    # Stream the cursor with positional access (no fetchall + dict(row) pass)
+    # Returning the response directly skips FastAPI's jsonable_encoder walk
+    return ORJSONResponse([
+        {
+            "id": r[0],
+            "group": r[1] or "noise",
+            "label": r[2][:30] + "...",
+            "val": r[3], # Size
+        }
+        for r in cursor
+    ])
 
 # CONTROL CENTER API ENDPOINTS (Phase 13)
 
 @app.get("/api/evolution/status")
 def get_evolution_status():
     """Get current evolution level and metrics"""
-    from core.evolution import EvolutionManager
-    evo = EvolutionManager()
+    from core.evolution import get_evolution_manager
+    evo = get_evolution_manager()
     metrics = evo.get_metrics()
     return {
         "level": metrics["current_level"],
@@ -106,37 +123,40 @@ def get_evolution_status():
 @app.post("/api/evolution/upgrade/{level}")
 def apply_evolution_upgrade(level: int):
     """Manually apply an evolution upgrade"""
-    from core.evolution import EvolutionManager
-    evo = EvolutionManager()
+    from core.evolution import get_evolution_manager
+    evo = get_evolution_manager()
     result = evo.apply_upgrade(level)
     return {"message": result}
 
 @app.post("/api/dream/trigger")
 def trigger_dream():
     """Manually trigger a dream cycle"""
-    from core.subconscious import Subconscious
-    sub = Subconscious()
+    from core.subconscious import get_subconscious
+    sub = get_subconscious()
     sub.dream()
     return {"message": "Dream cycle triggered"}
 
 @app.get("/api/dream/history")
 def get_dream_history():
     """Get recent dream connections"""
+    # One JOIN instead of two get_abstraction() hydrations per link
     cursor = manager.storage.conn.execute("""
-        SELECT source_id, target_id, weight FROM links 
-        WHERE type = 'dream_association' OR type = 'dreamt_association'
-        ORDER BY rowid DESC LIMIT 10
+        SELECT l.source_id, l.target_id, l.weight,
+               substr(a1.content_snippet, 1, 50), substr(a2.content_snippet, 1, 50)
+        FROM links l
+        LEFT JOIN abstractions a1 ON a1.id = l.source_id
+        LEFT JOIN abstractions a2 ON a2.id = l.target_id
+        WHERE l.type IN ('dream_association', 'dreamt_association')
+        ORDER BY l.rowid DESC LIMIT 10
     """)
-    dreams = []
-    for row in cursor.fetchall():
-        source = manager.storage.get_abstraction(row[0])
-        target = manager.storage.get_abstraction(row[1])
-        dreams.append({
-            "source": {"id": row[0], "content": source.content[:50] if source else "N/A"},
-            "target": {"id": row[1], "content": target.content[:50] if target else "N/A"},
-            "weight": row[2]
-        })
-    return dreams
+    return [
+        {
+            "source": {"id": r[0], "content": r[3] if r[3] is not None else "N/A"},
+            "target": {"id": r[1], "content": r[4] if r[4] is not None else "N/A"},
+            "weight": r[2]
+        }
+        for r in cursor
+    ]
 
 @app.put("/api/abstraction/{abs_id}/salience")
 def update_salience(abs_id: str, salience: float):
@@ -151,8 +171,8 @@ def update_salience(abs_id: str, salience: float):
 @app.get("/api/graph/{abs_id}")
 def get_subgraph(abs_id: str, depth: int = 1):
     """Get graph structure around an abstraction"""
-    from core.graph_manager import GraphManager
-    gm = GraphManager()
+    from core.graph_manager import get_graph_manager
+    gm = get_graph_manager()
     nodes = gm.explore_subgraph(abs_id, depth=depth)
     
     # Format as nodes + edges
@@ -169,45 +189,44 @@ def get_subgraph(abs_id: str, depth: int = 1):
 @app.get("/api/memory/search")
 def search_memories(q: str = "", cluster: str = None, min_quality: float = 0.0):
     """Search and filter memories"""
-    query = "SELECT id, content, quality_score, cluster_id, salience, last_used FROM abstractions WHERE 1=1"
+    # Fixed SQL shapes so sqlite3's statement cache reuses the compiled plans
     params = []
-    
-    if q:
-        query += " AND content LIKE ?"
-        params.append(f"%{q}%")
+    if q and manager.storage.has_fts and len(q) >= 3:
+        # Trigram index answers substring matches; quote q as a single phrase
+        query = ("SELECT a.id, a.content, a.quality_score, a.cluster_id, a.salience, a.last_used "
+                 "FROM abstractions_fts JOIN abstractions a ON a.rowid = abstractions_fts.rowid "
+                 "WHERE abstractions_fts MATCH ?")
+        params.append('"' + q.replace('"', '""') + '"')
+    else:
+        # Trigrams need 3+ chars; shorter queries (or no FTS5) scan with LIKE
+        query = "SELECT id, content, quality_score, cluster_id, salience, last_used FROM abstractions a WHERE 1=1"
+        if q:
+            query += " AND a.content LIKE ?"
+            params.append(f"%{q}%")
     if cluster:
-        query += " AND cluster_id = ?"
+        query += " AND a.cluster_id = ?"
         params.append(cluster)
     if min_quality > 0:
-        query += " AND quality_score >= ?"
+        query += " AND a.quality_score >= ?"
         params.append(min_quality)
     
-    query += " ORDER BY quality_score DESC LIMIT 100"
+    query += " ORDER BY a.quality_score DESC LIMIT 100"
     
+    manager.storage.flush_metrics()  # Filter/sort on current quality scores
     cursor = manager.storage.conn.execute(query, params)
-    results = []
-    for row in cursor.fetchall():
-        r = dict(row)
-        results.append(r)
-    return results
+    return ORJSONResponse([dict(r) for r in cursor])
 
 
 @app.get("/api/graph/all_links")
 def get_all_links():
-    """Get all graph links for 3D visualization"""
-    cursor = manager.storage.conn.execute("""
+    """Get all graph links for 3D visualization (columnar: one array per field)"""
+    rows = manager.storage.conn.execute("""
         SELECT source_id, target_id, type, weight FROM links 
         LIMIT 1000
-    """)
-    links = []
-    for row in cursor.fetchall():
-        links.append({
-            "source": row[0],
-            "target": row[1],
-            "type": row[2],
-            "value": row[3]
-        })
-    return links
+    """).fetchall()
+    # Columnar payload: keys are sent once instead of once per link
+    source, target, link_type, value = (list(col) for col in zip(*rows)) if rows else ([], [], [], [])
+    return ORJSONResponse({"source": source, "target": target, "type": link_type, "value": value})
 
 
 @app.websocket("/ws")
@@ -1,27 +1,51 @@
 import logging
+import numpy as np
 from pathlib import Path
-from typing import Optional
-from core.abstraction_manager import AbstractionManager
+from typing import Optional, Tuple
+from core.abstraction_manager import get_abstraction_manager
 
 logger = logging.getLogger(__name__)
 
+# Speech model is loaded once per process (was reloaded on every ingest)
+_whisper_model = None
+_whisper_backend = None
+
+def _transcribe(audio_path: str) -> Tuple[str, str]:
+    """
+    Transcribe audio -> (text, language).
+    Prefers faster-whisper with int8 weights (CTranslate2), falls back to openai-whisper.
+    """
+    global _whisper_model, _whisper_backend
+    if _whisper_model is None:
+        try:
+            from faster_whisper import WhisperModel
+            _whisper_model = WhisperModel("base", compute_type="int8")
+            _whisper_backend = "faster_whisper"
+        except ImportError:
+            import whisper
+            _whisper_model = whisper.load_model("base")  # Small model for speed
+            _whisper_backend = "whisper"
+            
+    if _whisper_backend == "faster_whisper":
+        segments, info = _whisper_model.transcribe(audio_path)
+        return " ".join(seg.text.strip() for seg in segments), info.language
+        
+    result = _whisper_model.transcribe(audio_path)
+    return result["text"], result.get("language", "unknown")
+
 class AudioProcessor:
     """
     Audio ingestion using Whisper (Phase 15).
     Transcribes audio → creates abstraction.
     """
     def __init__(self):
-        self.am = AbstractionManager()
+        self.am = get_abstraction_manager()
         
     def ingest_audio(self, audio_path: str, description: str = "") -> Optional[str]:
         """Transcribe audio and create abstraction"""
         try:
-            import whisper
-            
             logger.info(f"Transcribing audio: {audio_path}")
-            model = whisper.load_model("base")  # Small model for speed
-            result = model.transcribe(audio_path)
-            transcript = result["text"]
+            transcript, language = _transcribe(audio_path)
             
             # Create abstraction
             content = f"{description}\n\nTranscript: {transcript}" if description else transcript
@@ -30,7 +54,7 @@ class AudioProcessor:
                 metadata={
                     "source": "audio",
                     "audio_path": audio_path,
-                    "language": result.get("language", "unknown")
+                    "language": language or "unknown"
                 }
             )
             
@@ -38,7 +62,7 @@ class AudioProcessor:
             return abs_obj.id
             
         except ImportError:
-            logger.error("Whisper not installed. Run: pip install openai-whisper")
+            logger.error("Whisper not installed. Run: pip install faster-whisper")
             return None
         except Exception as e:
             logger.error(f"Audio ingestion failed: {e}")
@@ -50,42 +74,55 @@ class VideoProcessor:
     Extracts keyframes → embeds with CLIP.
     """
     def __init__(self):
-        self.am = AbstractionManager()
+        self.am = get_abstraction_manager()
         
     def ingest_video(self, video_path: str, description: str = "") -> Optional[str]:
         """Extract keyframes and create abstraction"""
         try:
             import cv2
-            from core.embedding import EmbeddingHandler
             
             logger.info(f"Processing video: {video_path}")
             
             # Extract keyframes (1 per 5s)
             cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_interval = int(fps * 5)  # Every 5 seconds
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            frame_interval = max(1, int(fps * 5))  # Every 5 seconds
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             
             frames = []
-            frame_count = 0
             
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                if frame_count % frame_interval == 0:
+            if total_frames > 0:
+                # Seek to each sampled frame instead of decoding the whole stream
+                for frame_idx in range(0, total_frames, frame_interval):
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
                     frames.append(frame)
-                    
-                frame_count += 1
+            else:
+                # Unknown length: grab() advances without decoding skipped frames
+                frame_count = 0
+                while cap.grab():
+                    if frame_count % frame_interval == 0:
+                        ret, frame = cap.retrieve()
+                        if ret:
+                            frames.append(frame)
+                    frame_count += 1
                 
             cap.release()
             
             logger.info(f"Extracted {len(frames)} keyframes")
             
-            # Average CLIP embeddings
-            embedder = EmbeddingHandler()
-            # For simplicity, just get embedding of first frame
-            # In V2, average all frames or save separately
+            # Average CLIP embeddings (one batched forward pass over all keyframes)
+            video_embedding = None
+            if frames:
+                from PIL import Image
+                images = [Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)) for f in frames]
+                frame_embeddings = self.am.embedder.generate_embedding(images)
+                video_embedding = frame_embeddings.mean(axis=0)
+                norm = np.linalg.norm(video_embedding)
+                if norm > 0:
+                    video_embedding = video_embedding / norm
             
             content = f"{description}\n\nVideo with {len(frames)} keyframes (extracted every 5s)"
             abs_obj, created = self.am.create_abstraction(
@@ -97,6 +134,10 @@ class VideoProcessor:
                 }
             )
             
+            # Visual embedding goes to the image (CLIP) collection
+            if created and video_embedding is not None:
+                self.am.storage.add_abstraction(abs_obj, video_embedding)
+            
             logger.info(f"✅ Video ingested: {abs_obj.id[:8]}")
             return abs_obj.id
             
@@ -0,0 +1,61 @@
+# core/bloom.py
+# In-memory membership filter for dedup keys: "definitely absent" answers
+# skip SQLite entirely; "maybe present" falls through to a real lookup.
+
+import math
+from typing import Iterable, List
+import numpy as np
+import xxhash
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over strings (double hashing on one xxh3_128)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(int(capacity), 1)
+        self.num_bits = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 64)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        digest = xxhash.xxh3_128_intdigest(key.encode('utf-8'))
+        h1, h2 = digest & 0xFFFFFFFFFFFFFFFF, (digest >> 64) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ScalableBloomFilter:
+    """
+    Grows by chaining filters of doubling capacity (tighter error per stage)
+    so the overall false-positive rate stays near error_rate. No deletes:
+    a removed key only costs a false positive, which callers verify anyway.
+    """
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(initial_capacity, error_rate / 2)]
+
+    def add(self, key: str):
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * 2, self.error_rate / 2 ** (len(self.filters) + 1))
+            self.filters.append(current)
+        current.add(key)
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in f for f in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self.filters)
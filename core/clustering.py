@@ -4,10 +4,23 @@ import logging
 from typing import List, Dict, Tuple
 from core.storage import EngramStorage
 from core.abstraction import Abstraction
+from core.quantization import quantize_embeddings, cosine_scores
 from utils import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import fast_hdbscan
+    HAS_FAST_HDBSCAN = True
+except ImportError:
+    HAS_FAST_HDBSCAN = False
+
+try:
+    import umap
+    HAS_UMAP = True
+except ImportError:
+    HAS_UMAP = False
+
 
 def compute_axiom_affinity(abstraction: Abstraction) -> float:
     """
@@ -38,19 +51,111 @@ def compute_axiom_affinity(abstraction: Abstraction) -> float:
 class ClusteringEngine:
     def __init__(self):
         self.storage = EngramStorage()
-        self.clusterer = hdbscan.HDBSCAN(
-            min_cluster_size=config.HDBSCAN_MIN_CLUSTER_SIZE,
-            min_samples=config.HDBSCAN_MIN_SAMPLES,
-            metric=config.HDBSCAN_METRIC,
-            cluster_selection_epsilon=config.HDBSCAN_EPSILON,
-            prediction_data=config.HDBSCAN_PREDICTION_DATA
+        # fast_hdbscan is euclidean-only and wants low-dim input (UMAP first)
+        self.use_fast = (
+            config.USE_FAST_HDBSCAN and HAS_FAST_HDBSCAN
+            and config.HDBSCAN_METRIC == 'euclidean'
+            and (HAS_UMAP or config.EMBEDDING_DIMENSION <= 20)
         )
+        if self.use_fast:
+            self.clusterer = fast_hdbscan.HDBSCAN(
+                min_cluster_size=config.HDBSCAN_MIN_CLUSTER_SIZE,
+                min_samples=config.HDBSCAN_MIN_SAMPLES,
+                cluster_selection_epsilon=config.HDBSCAN_EPSILON,
+            )
+        else:
+            self.clusterer = hdbscan.HDBSCAN(
+                min_cluster_size=config.HDBSCAN_MIN_CLUSTER_SIZE,
+                min_samples=config.HDBSCAN_MIN_SAMPLES,
+                metric=config.HDBSCAN_METRIC,
+                cluster_selection_epsilon=config.HDBSCAN_EPSILON,
+                prediction_data=config.HDBSCAN_PREDICTION_DATA
+            )
         self.fitted = False
         
+        # Fast path state: cached UMAP reducer + fitted points for prediction
+        self.reducer = None
+        self._fit_points = None
+        self._fit_labels = None
+        
+        # Normalized per-cluster mean embeddings for nearest-centroid prediction
+        self.centroids = None
+        self.centroid_ids: List[str] = []
+        
         # Axiom affinity threshold for protection
         self.axiom_affinity_threshold = 0.7
         self.axiom_decay_multiplier = 0.1  # 10x slower decay for foundational clusters
 
+    def _bulk_axiom_affinity(self, ids: List[str]) -> Dict[str, float]:
+        """
+        Vectorized compute_axiom_affinity for many abstractions.
+        Reads only the scoring columns (no Abstraction hydration) and scores
+        them with NumPy instead of a Python branch chain per row.
+        """
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self.storage.conn.execute(f"""
+                SELECT id,
+                       COALESCE(is_axiom_derived, 0),
+                       COALESCE(consistency_score, 1.0),
+                       COALESCE(json_extract(metadata, '$.proof_count'), 0),
+                       (SELECT COUNT(*) FROM abstraction_axioms WHERE abstraction_id = abstractions.id)
+                FROM abstractions WHERE id IN ({placeholders})
+            """, chunk)
+            rows.extend(cursor.fetchall())
+            
+        if not rows:
+            return {}
+            
+        row_ids = [r[0] for r in rows]
+        axiom_derived = np.array([r[1] for r in rows], dtype=bool)
+        consistency = np.array([r[2] for r in rows], dtype=np.float64)
+        proof_count = np.array([r[3] for r in rows], dtype=np.float64)
+        axioms_used = np.array([r[4] for r in rows], dtype=np.int64)
+        
+        has_proofs = proof_count > 0
+        scores = (
+            0.4 * axiom_derived
+            + 0.3 * has_proofs
+            + 0.15 * (~has_proofs & (axioms_used > 0))
+            + 0.3 * (consistency > 0.9)
+            + 0.1 * ((consistency > 0.7) & (consistency <= 0.9))
+        )
+        np.minimum(scores, 1.0, out=scores)
+        return dict(zip(row_ids, scores.tolist()))
+
+    def _fit_fast(self, embeddings: np.ndarray):
+        """Fit fast_hdbscan on UMAP-reduced embeddings, keeping state for predict_cluster"""
+        points = embeddings
+        self.reducer = None
+        # UMAP's spectral init needs more points than target dims
+        if HAS_UMAP and embeddings.shape[1] > config.HDBSCAN_REDUCE_DIM and len(embeddings) > config.HDBSCAN_REDUCE_DIM + 1:
+            self.reducer = umap.UMAP(
+                n_components=config.HDBSCAN_REDUCE_DIM,
+                n_neighbors=min(15, len(embeddings) - 1),
+                min_dist=0.0,  # Tight packing suits density clustering
+            )
+            points = self.reducer.fit_transform(embeddings).astype(np.float32)
+        self.clusterer.fit(points)
+        self._fit_points = points
+        self._fit_labels = self.clusterer.labels_
+
+    def _compute_centroids(self, embeddings: np.ndarray, labels: np.ndarray):
+        """Unit-length mean embedding per cluster (noise excluded)"""
+        mask = labels >= 0
+        if not mask.any():
+            self.centroids, self.centroid_ids = None, []
+            return
+        cluster_labels, inverse = np.unique(labels[mask], return_inverse=True)
+        sums = np.zeros((len(cluster_labels), embeddings.shape[1]), dtype=np.float32)
+        np.add.at(sums, inverse, embeddings[mask])
+        sums /= np.linalg.norm(sums, axis=1, keepdims=True) + 1e-10
+        # Optionally fp16/int8: the per-ingest scan reads 2-4x fewer bytes
+        self.centroids = quantize_embeddings(sums, config.EMBEDDING_DTYPE)
+        self.centroid_ids = [str(label) for label in cluster_labels]
+
     def perform_clustering(self):
         """
         Run full clustering on all abstractions.
@@ -59,14 +164,15 @@ class ClusteringEngine:
         """
         # 1. Fetch all embeddings & IDs
         # Note: In production with >10k items, we'd batch this or use incremental
-        embeddings_data = self.storage.collection.get(include=['embeddings', 'metadatas'])
+        embeddings_data = self.storage.collection.get(include=['embeddings'])
         
         if not embeddings_data['ids']:
             logger.info("No data to cluster.")
             return
 
         ids = embeddings_data['ids']
-        embeddings = np.array(embeddings_data['embeddings'])
+        # Model output is float32; keep it (float64 doubles HDBSCAN's distance work)
+        embeddings = np.asarray(embeddings_data['embeddings'], dtype=np.float32)
         
         if len(ids) < config.HDBSCAN_MIN_CLUSTER_SIZE:
             logger.info("Not enough data to cluster yet.")
@@ -74,32 +180,43 @@ class ClusteringEngine:
 
         # 2. Fit HDBSCAN
         logger.info(f"Clustering {len(ids)} items...")
-        self.clusterer.fit(embeddings)
+        if self.use_fast:
+            self._fit_fast(embeddings)
+        else:
+            self.clusterer.fit(embeddings)
         self.fitted = True
         
         labels = self.clusterer.labels_
+        self._compute_centroids(embeddings, labels)
         
         # 3. Update Storage with axiom affinity awareness
+        # Diff against current labels as columns (no per-row hydration)
+        current = self.storage.fetch_columns(ids, ["id", "cluster_id"])
+        position = {doc_id: i for i, doc_id in enumerate(ids)}
+        rows = np.fromiter((position[doc_id] for doc_id in current["id"]), dtype=np.intp, count=len(current["id"]))
+        row_labels = labels[rows]
+        new_cluster_ids = np.where(row_labels == -1, "noise", row_labels.astype(str)).astype(object)
+        changed = np.flatnonzero(new_cluster_ids != current["cluster_id"]).tolist()
+        
+        # Axiom affinity only matters for rows about to become noise
+        affinities = self._bulk_axiom_affinity(
+            [current["id"][i] for i in changed if new_cluster_ids[i] == "noise"]
+        )
         updates = []
         foundational_count = 0
+        for i in changed:
+            doc_id, cluster_id = current["id"][i], new_cluster_ids[i]
+            # Check axiom affinity before moving to noise
+            if cluster_id == "noise" and affinities.get(doc_id, 0.0) > self.axiom_affinity_threshold:
+                # Protect axiom-derived engrams from being classified as noise
+                cluster_id = "foundational"
+                foundational_count += 1
+                if current["cluster_id"][i] == cluster_id:
+                    continue
+            updates.append((doc_id, cluster_id))
         
-        for i, doc_id in enumerate(ids):
-            label = labels[i]
-            cluster_id = str(label) if label != -1 else "noise"
-            
-            abs_obj = self.storage.get_abstraction(doc_id)
-            if abs_obj and abs_obj.cluster_id != cluster_id:
-                # Check axiom affinity before moving to noise
-                affinity = compute_axiom_affinity(abs_obj)
-                
-                if cluster_id == "noise" and affinity > self.axiom_affinity_threshold:
-                    # Protect axiom-derived engrams from being classified as noise
-                    cluster_id = "foundational"
-                    foundational_count += 1
-                
-                abs_obj.cluster_id = cluster_id
-                self.storage.add_abstraction(abs_obj, embeddings[i])
-                updates.append(doc_id)
+        # Single batched write instead of one re-embed + commit per row
+        self.storage.update_cluster_ids(updates)
                 
         num_clusters = len(set(labels)) - (1 if -1 in labels else 0)
         logger.info(f"Clustering complete. Updated {len(updates)} items. "
@@ -116,7 +233,21 @@ class ClusteringEngine:
             
         try:
             # Reshape for single prediction
-            embedding_np = np.array(embedding).reshape(1, -1)
+            embedding_np = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+            if not config.HDBSCAN_EXACT_PREDICT and self.centroids is not None:
+                # Cosine to every centroid in one GEMV (both sides unit length)
+                scores = cosine_scores(self.centroids, embedding_np[0])
+                best = int(np.argmax(scores))
+                if scores[best] < config.CLUSTER_PREDICT_MIN_SIMILARITY:
+                    return "noise"
+                return self.centroid_ids[best]
+            if self.use_fast:
+                # fast_hdbscan has no approximate_predict: label of nearest fitted point
+                if self.reducer is not None:
+                    embedding_np = self.reducer.transform(embedding_np).astype(np.float32)
+                d2 = ((self._fit_points - embedding_np) ** 2).sum(axis=1)
+                label = self._fit_labels[int(np.argmin(d2))]
+                return str(label) if label != -1 else "noise"
             label, strength = hdbscan.approximate_predict(self.clusterer, embedding_np)
             return str(label[0]) if label[0] != -1 else "noise"
         except Exception as e:
@@ -1,10 +1,12 @@
 import logging
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from core.abstraction_manager import AbstractionManager
 from integration.llm_interface import LLMInterface
 from core.storage import EngramStorage
+from core.truth_guard import TruthGuard
 from utils import config
 from utils.metrics import MetricsTracker
 
@@ -52,21 +54,21 @@ class CognitiveLoop:
             logger.info("Cognitive Loop: No weak abstractions found. System is stable.")
             return
 
-        # 2. Refine Each
-        for abs_obj in candidates:
-            logger.info(f"Refining abstraction {abs_obj.id} (Quality: {abs_obj.quality_score:.2f})")
-            
-            # 3. Generate Improved Content
-            improved_content = self.llm.refine_abstraction(abs_obj.content)
-            
+        # 2. Truth Guard self-check up front (depends only on the original memory)
+        risks = TruthGuard.calculate_risk_batch(candidates)
+        
+        # 3. Generate Improved Content concurrently (LLM calls are network-bound)
+        workers = min(config.MAX_CONCURRENT_REFINEMENTS, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            refined = list(pool.map(self._refine, candidates))
+        
+        # 4. Apply results sequentially
+        for abs_obj, (risk, is_safe), improved_content in zip(candidates, risks, refined):
             if improved_content and improved_content != abs_obj.content:
-                # Truth Guard self-check
-                from core.truth_guard import TruthGuard
-                risk, is_safe = TruthGuard.calculate_risk([abs_obj])  # self-check
                 if not is_safe:
                     improved_content = f"[REFINED WITH LOW CONFIDENCE] {improved_content}"
                 
-                # 4. Update
+                # Update
                 old_len = len(abs_obj.content)
                 self.manager.update_abstraction(abs_obj.id, content=improved_content)
                 new_len = len(improved_content)
@@ -78,17 +80,21 @@ class CognitiveLoop:
             else:
                 logger.info(" -> No improvement generated.")
 
+    def _refine(self, abs_obj) -> Optional[str]:
+        """Worker body: one LLM refinement"""
+        logger.info(f"Refining abstraction {abs_obj.id} (Quality: {abs_obj.quality_score:.2f})")
+        return self.llm.refine_abstraction(abs_obj.content)
+
     def _find_weak_abstractions(self, limit: int) -> List:
         """Find abstractions with low quality score"""
         candidates = []
         try:
+            self.storage.flush_metrics()  # Select on current quality scores
             cursor = self.storage.conn.execute(
                 "SELECT id FROM abstractions WHERE quality_score < ? ORDER BY quality_score ASC LIMIT ?",
                 (config.UNCERTAINTY_THRESHOLD, limit)
             )
-            rows = cursor.fetchall()
-            for row in rows:
-                candidates.append(self.storage.get_abstraction(row[0]))
+            candidates = self.storage.get_abstractions_bulk([row[0] for row in cursor.fetchall()])
         except Exception as e:
             logger.error(f"Failed to query weak abstractions: {e}")
             
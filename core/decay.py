@@ -1,5 +1,7 @@
 import logging
 import math
+import numpy as np
+import time
 from datetime import datetime
 from typing import List, Dict
 from core.storage import EngramStorage
@@ -8,6 +10,38 @@ from utils import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _decay_kernel_np(now, last_used, reuse, acc, rate, acc_thresh):
+    """Vectorized calculate_decay over SoA arrays"""
+    days = (now - last_used) / 86400.0
+    decay = -np.expm1(-rate * days)  # 1 - e^x without cancellation for small days
+    decay *= np.where(reuse > 5, 0.5, 1.0)        # High reuse protection
+    decay *= np.where(acc >= acc_thresh, 0.7, 1.0)  # High accuracy protection
+    return np.minimum(decay, 1.0)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _decay_kernel(now, last_used, reuse, acc, rate, acc_thresh):
+        out = np.empty(last_used.shape[0], dtype=np.float64)
+        for i in prange(last_used.shape[0]):
+            d = -np.expm1(-rate * ((now - last_used[i]) / 86400.0))
+            if reuse[i] > 5:
+                d *= 0.5
+            if acc[i] >= acc_thresh:
+                d *= 0.7
+            out[i] = min(d, 1.0)
+        return out
+else:
+    _decay_kernel = _decay_kernel_np
+
+
 class DecaySystem:
     def __init__(self):
         self.storage = EngramStorage()
@@ -21,7 +55,7 @@ class DecaySystem:
         
         # Exponential decay: 1 - e^(-rate * days)
         decay_rate = config.DECAY_RATE_DAILY
-        raw_decay = 1.0 - math.exp(-decay_rate * days_unused)
+        raw_decay = -math.expm1(-decay_rate * days_unused)
         
         # Modifiers (Protection)
         
@@ -39,37 +73,44 @@ class DecaySystem:
         """
         Update decay scores for ALL abstractions and prune if necessary.
         """
-        # 1. Get all abstractions (iterative in prod, all-at-once for V1)
-        cursor = self.storage.conn.execute("SELECT id FROM abstractions")
-        all_ids = [row[0] for row in cursor.fetchall()]
-        
-        pruned_count = 0
-        updated_count = 0
+        # 1. Load decay inputs as arrays (one SELECT, no per-row hydration)
+        soa = self.storage.load_decay_soa()
+        ids = soa["ids"]
+        if not ids:
+            logger.info("Decay cycle complete. Updated 0, Pruned 0.")
+            return
+            
+        now = time.time()
+        decay = _decay_kernel(
+            now, soa["last_used"], soa["reuse_contexts"], soa["accuracy_preserved"],
+            config.DECAY_RATE_DAILY, config.PROTECT_ACCURACY_THRESHOLD
+        )
         
-        # Cache cluster counts for Rule 0 (Orphan Protection)
+        # 2. Pruning candidates (Rules 1 & 2), then Rule 0 per cluster
+        candidates = np.flatnonzero(
+            ((decay > 0.8) & (soa["usage_count"] < 2))
+            | (decay > config.PRUNE_THRESHOLD + 0.5)
+        )
         cluster_counts = self._get_cluster_counts()
-        
-        for abs_id in all_ids:
-            abs_obj = self.storage.get_abstraction(abs_id)
-            if not abs_obj:
+        prune_ids = []
+        for i in candidates.tolist():
+            cluster_id = soa["cluster_ids"][i]
+            # Rule 0: Orphan Protection - never prune the last item in a cluster
+            if cluster_id and cluster_counts.get(cluster_id, 0) <= 1:
                 continue
+            prune_ids.append(ids[i])
+            if cluster_id:
+                cluster_counts[cluster_id] -= 1
                 
-            # Update Score
-            new_decay = self.calculate_decay(abs_obj)
-            abs_obj.decay_score = new_decay
-            
-            # Check Pruning
-            if self._should_prune(abs_obj, cluster_counts):
-                self._prune(abs_obj)
-                pruned_count += 1
-                # Update cluster count cache decrement
-                if abs_obj.cluster_id:
-                    cluster_counts[abs_obj.cluster_id] = cluster_counts.get(abs_obj.cluster_id, 1) - 1
-            else:
-                self.storage.update_metrics(abs_obj)
-                updated_count += 1
+        # 3. Persist
+        pruned = set(prune_ids)
+        updates = [(score, abs_id) for abs_id, score in zip(ids, decay.tolist()) if abs_id not in pruned]
+        if prune_ids:
+            logger.info(f"Pruning {len(prune_ids)} abstractions: {', '.join(i[:8] for i in prune_ids[:20])}")
+        # One transaction for all updates + deletes, one Chroma delete per 500 ids
+        self.storage.apply_decay(updates, prune_ids)
                 
-        logger.info(f"Decay cycle complete. Updated {updated_count}, Pruned {pruned_count}.")
+        logger.info(f"Decay cycle complete. Updated {len(updates)}, Pruned {len(prune_ids)}.")
 
     def _get_cluster_counts(self) -> Dict[str, int]:
         """Get count of items in each cluster for Rule 0"""
@@ -77,37 +118,3 @@ class DecaySystem:
             "SELECT cluster_id, COUNT(*) FROM abstractions GROUP BY cluster_id"
         )
         return {row[0]: row[1] for row in cursor.fetchall() if row[0]}
-
-    def _should_prune(self, abs_obj: Abstraction, cluster_counts: Dict[str, int]) -> bool:
-        """Apply Pruning Rules"""
-        
-        # Rule 0: High Priority - Orphan Protection
-        # If it's the last item in a cluster, KEEP IT.
-        if abs_obj.cluster_id and cluster_counts.get(abs_obj.cluster_id, 0) <= 1:
-            return False
-            
-        # Rule 1: Fast Decay for unused low-quality
-        if abs_obj.decay_score > 0.8 and abs_obj.usage_count < 2:
-            return True
-            
-        # Rule 2: Hard limit
-        if abs_obj.decay_score > config.PRUNE_THRESHOLD + 0.5: # e.g., > 0.9
-            return True
-        
-        # Rule 3: Quality Threshold
-        # If quality drops below threshold due to decay
-        # (calculated outside this func, but let's check decay part)
-        # Note: Quality formula includes decay, but we can check raw decay too.
-        
-        return False
-
-    def _prune(self, abs_obj: Abstraction):
-        """Delete from DBs"""
-        logger.info(f"Pruning abstraction {abs_obj.id} (Decay: {abs_obj.decay_score:.2f})")
-        
-        # 1. Delete from Chroma
-        self.storage.collection.delete(ids=[abs_obj.id])
-        
-        # 2. Delete from SQLite
-        self.storage.conn.execute("DELETE FROM abstractions WHERE id = ?", (abs_obj.id,))
-        self.storage.conn.commit()
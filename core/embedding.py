@@ -1,9 +1,74 @@
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List, Union
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional, Union
 from utils import config
+from core.quantization import quantize_embeddings
 from PIL import Image
 
+
+class EmbeddingBatcher:
+    """
+    Coalesces single-text encode requests from many threads into batched
+    encode calls on one worker thread. A lone request is encoded immediately;
+    when others are already queued the worker waits up to the window to fill
+    the batch.
+    """
+    def __init__(self, model: SentenceTransformer, max_batch: int = 64, window_ms: float = 20):
+        self.model = model
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self.queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="EmbeddingBatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        self.queue.put((text, future))
+        return future
+
+    def _collect(self) -> list:
+        batch = [self.queue.get()]
+        # Drain whatever is already waiting
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        # Concurrent callers present: give stragglers the window to join
+        if 1 < len(batch) < self.max_batch:
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                embeddings = self.model.encode(
+                    [text for text, _ in batch], batch_size=self.max_batch,
+                    convert_to_numpy=True, normalize_embeddings=True
+                )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+
+
 class EmbeddingHandler:
     _instance = None
     
@@ -13,8 +78,68 @@ class EmbeddingHandler:
             cls._instance.text_model = SentenceTransformer(config.EMBEDDING_MODEL_NAME)
             # Lazy load CLIP model to save RAM if not used immediately
             cls._instance.clip_model = None 
+            cls._instance._batcher = None
+            cls._instance._batcher_lock = threading.Lock()
+            # Text embedding LRU keyed by a 128-bit blake2b digest of the text
+            cls._instance._cache = OrderedDict()
+            cls._instance._cache_lock = threading.Lock()
         return cls._instance
 
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+        return embedding
+
+    def _cache_put(self, key: bytes, embedding: np.ndarray):
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > config.EMBEDDING_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop cached text embeddings (call after swapping the text model)"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _encode_texts(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Encode texts through the LRU: only cache misses reach the model"""
+        keys = [self._text_key(t) for t in texts]
+        cached = [self._cache_get(k) for k in keys]
+        missing = [i for i, e in enumerate(cached) if e is None]
+        if missing:
+            if len(texts) == 1:
+                # Single texts share the micro-batcher with concurrent callers
+                fresh = [self.encode_async(texts[0]).result()]
+            else:
+                fresh = self.text_model.encode(
+                    [texts[i] for i in missing], batch_size=batch_size,
+                    convert_to_numpy=True, normalize_embeddings=True
+                )
+            for i, embedding in zip(missing, fresh):
+                self._cache_put(keys[i], embedding)
+                cached[i] = embedding
+        # np.stack copies, so callers can't mutate cached vectors
+        return np.stack(cached)
+
+    def encode_async(self, text: str) -> Future:
+        """Queue one text for micro-batched encoding; resolves to a normalized vector"""
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = EmbeddingBatcher(
+                        self.text_model,
+                        max_batch=config.EMBEDDING_BATCH_SIZE,
+                        window_ms=config.EMBEDDING_BATCH_WINDOW_MS,
+                    )
+        return self._batcher.submit(text)
+
     def _get_clip_model(self):
         if self.clip_model is None:
             # clip-ViT-B-32 works for both Image and Text 
@@ -22,29 +147,37 @@ class EmbeddingHandler:
             self.clip_model = SentenceTransformer('clip-ViT-B-32')
         return self.clip_model
 
-    def generate_embedding(self, content: Union[str, List[str], Image.Image]) -> np.ndarray:
+    def generate_embedding(self, content: Union[str, List[str], Image.Image, List[Image.Image]],
+                           batch_size: int = 64, dtype: Optional[str] = None) -> np.ndarray:
         """
         Generate normalized embeddings for text OR image.
+        Lists (texts or images) are encoded in batches of batch_size.
+        dtype ("float16"/"int8") returns a quantized copy for in-memory scans;
+        vector-store writes keep the float32 default.
         Returns numpy array.
         """
-        # Image Handling
-        if isinstance(content, Image.Image):
-            model = self._get_clip_model()
-            embeddings = model.encode(content, convert_to_numpy=True)
+        # Text goes through the LRU cache (and the micro-batcher for single texts)
+        if isinstance(content, str):
+            embeddings = self._encode_texts([content], batch_size)[0]
+        elif isinstance(content, list) and content and isinstance(content[0], str):
+            embeddings = self._encode_texts(content, batch_size)
             
-        # Text Handling
-        else:
-            # Default to text model
-            embeddings = self.text_model.encode(content, convert_to_numpy=True)
-        
-        # Normalize
-        if len(embeddings.shape) == 1:
-            norm = np.linalg.norm(embeddings)
-            if norm > 0:
-                embeddings = embeddings / norm
         else:
-            norm = np.linalg.norm(embeddings, axis=1, keepdims=True)
-            embeddings = embeddings / (norm + 1e-10)
+            # Image Handling
+            if isinstance(content, Image.Image) or (
+                isinstance(content, list) and content and isinstance(content[0], Image.Image)
+            ):
+                model = self._get_clip_model()
+            # Text Handling
+            else:
+                # Default to text model
+                model = self.text_model
+                
+            # Normalization is fused into encode (no second pass over the output)
+            embeddings = model.encode(
+                content, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+            )
             
+        if dtype:
+            embeddings = quantize_embeddings(embeddings, dtype)
         return embeddings
-
@@ -4,8 +4,10 @@ from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from functools import lru_cache
 from core.storage import EngramStorage
-from core.abstraction_manager import AbstractionManager
+from core.truth_guard import TruthGuard
+from core.abstraction_manager import get_abstraction_manager
 from utils import config
 
 logger = logging.getLogger(__name__)
@@ -18,18 +20,19 @@ class EvolutionManager:
     
     def __init__(self):
         self.storage = EngramStorage()
-        self.am = AbstractionManager()
+        self.am = get_abstraction_manager()
         self._ensure_evolution_state()
         
     def _ensure_evolution_state(self):
         """Ensure the evolution state table exists in SQLite"""
-        self.storage.conn.execute("""
-            CREATE TABLE IF NOT EXISTS system_evolution (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-        self.storage.conn.commit()
+        with self.storage._write_lock:
+            self.storage.conn.execute("""
+                CREATE TABLE IF NOT EXISTS system_evolution (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            self.storage.conn.commit()
         
     def get_state(self, key: str, default: Any = None) -> Any:
         cursor = self.storage.conn.execute("SELECT value FROM system_evolution WHERE key = ?", (key,))
@@ -41,23 +44,39 @@ class EvolutionManager:
                 return row[0]
         return default
 
+    def get_states(self, *keys: str) -> Dict[str, Any]:
+        """Several state values in one query; missing keys are omitted"""
+        placeholders = ",".join("?" * len(keys))
+        cursor = self.storage.conn.execute(
+            f"SELECT key, value FROM system_evolution WHERE key IN ({placeholders})", keys
+        )
+        states = {}
+        for key, value in cursor.fetchall():
+            try:
+                states[key] = json.loads(value)
+            except:
+                states[key] = value
+        return states
+
     def set_state(self, key: str, value: Any):
-        self.storage.conn.execute("INSERT OR REPLACE INTO system_evolution VALUES (?, ?)", (key, json.dumps(value)))
-        self.storage.conn.commit()
+        with self.storage._write_lock:
+            self.storage.conn.execute("INSERT OR REPLACE INTO system_evolution VALUES (?, ?)", (key, json.dumps(value)))
+            self.storage.conn.commit()
 
     def get_metrics(self) -> Dict[str, Any]:
         """Calculate implementation fitness metrics"""
-        # Total Abstractions
-        cursor = self.storage.conn.execute("SELECT COUNT(*), AVG(quality_score), AVG(compression_ratio) FROM abstractions")
-        count, avg_quality, avg_compression = cursor.fetchone()
-        
-        # Successful Refinements (approximate for now, using successful_application_count sum)
-        cursor = self.storage.conn.execute("SELECT SUM(successful_application_count) FROM abstractions")
-        refinements = cursor.fetchone()[0] or 0
+        # All aggregates in one table scan
+        # Successful Refinements approximated by successful_application_count sum
+        self.storage.flush_metrics()
+        cursor = self.storage.conn.execute("""
+            SELECT COUNT(*), AVG(quality_score), AVG(compression_ratio),
+                   COALESCE(SUM(successful_application_count), 0),
+                   COALESCE(SUM(reuse_contexts), 0)
+            FROM abstractions
+        """)
+        count, avg_quality, avg_compression, refinements, total_reuse = cursor.fetchone()
         
-        # Reuse Contexts
-        cursor = self.storage.conn.execute("SELECT SUM(reuse_contexts) FROM abstractions")
-        total_reuse = cursor.fetchone()[0] or 0
+        state = self.get_states("dream_insight_count", "evolution_level")
         
         metrics = {
             "total_abstractions": count,
@@ -65,8 +84,8 @@ class EvolutionManager:
             "avg_compression": avg_compression or 0.0,
             "total_refinements": refinements,
             "total_reuse": total_reuse,
-            "dream_insights": self.get_state("dream_insight_count", 0),
-            "current_level": self.get_state("evolution_level", 0)
+            "dream_insights": state.get("dream_insight_count", 0),
+            "current_level": state.get("evolution_level", 0)
         }
         return metrics
 
@@ -81,7 +100,6 @@ class EvolutionManager:
         logger.info(f"🧬 Evolution Check. Level: {current_level}. Metrics: {metrics}")
         
         # Truth Guard: Don't evolve if memory confidence is too low
-        from core.truth_guard import TruthGuard
         top_abs = self._get_top_abstractions()
         risk, is_safe = TruthGuard.calculate_risk(top_abs)
         if not is_safe:
@@ -147,12 +165,7 @@ class EvolutionManager:
             return "Dream Mode disabled."
             
         # 1. Pick 2 random high quality abstractions
-        cursor = self.storage.conn.execute("""
-            SELECT id, content FROM abstractions 
-            WHERE quality_score > 0.7 
-            ORDER BY RANDOM() LIMIT 2
-        """)
-        nodes = cursor.fetchall()
+        nodes = self.storage.sample_by_quality(0.7, 2)
         
         if len(nodes) < 2:
             return "Not enough high-quality memories to dream."
@@ -166,8 +179,8 @@ class EvolutionManager:
         insight = f"Dream connection between {n1[0][:4]} and {n2[0][:4]}"
         
         # Create meta-abstraction
-        from core.graph_manager import GraphManager
-        gm = GraphManager()
+        from core.graph_manager import get_graph_manager
+        gm = get_graph_manager()
         
         # Link them
         gm.add_link(n1[0], n2[0], type="dream_association", weight=0.5)
@@ -179,11 +192,11 @@ class EvolutionManager:
         return f"Dreamt of connection between {n1[0]} and {n2[0]}."
     
     def _get_top_abstractions(self) -> List:
-        """Helper: Get top 10 abstractions for quality checks"""
-        cursor = self.storage.conn.execute("""
-            SELECT id FROM abstractions 
-            ORDER BY quality_score DESC LIMIT 10
-        """)
-        rows = cursor.fetchall()
-        return [self.storage.get_abstraction(row[0]) for row in rows if self.storage.get_abstraction(row[0])]
+        """Helper: Get top 10 abstractions (score-only tuples) for quality checks"""
+        return self.storage.top_abstractions_light(10)
+
 
+@lru_cache(maxsize=1)
+def get_evolution_manager() -> EvolutionManager:
+    """Process-wide shared EvolutionManager (skips the schema check per request)"""
+    return EvolutionManager()
@@ -1,11 +1,19 @@
 
 import logging
+from functools import lru_cache
 from typing import List, Optional, Tuple
 from core.storage import EngramStorage
-from core.abstraction import Abstraction, Link
+from core.abstraction import Abstraction
 
 logger = logging.getLogger(__name__)
 
+# Fixed SQL text so sqlite3's statement cache reuses the compiled statements
+_SQL_ADD_LINK = """
+    INSERT INTO links VALUES (?, ?, ?, ?)
+    ON CONFLICT(source_id, target_id, type) DO UPDATE SET weight = excluded.weight
+"""
+_SQL_COUNT_PAIR = "SELECT COUNT(*) FROM abstractions WHERE id IN (?, ?)"
+
 class GraphManager:
     """
     Manages the Knowledge Graph layer of the Engram System.
@@ -14,43 +22,55 @@ class GraphManager:
     def __init__(self):
         self.storage = EngramStorage()
 
-    def add_link(self, source_id: str, target_id: str, type: str = "relates_to", weight: float = 1.0):
-        """Create a directed link between two abstractions"""
-        # Verify both exist
-        source = self.storage.get_abstraction(source_id)
-        target = self.storage.get_abstraction(target_id)
-        
-        if not source or not target:
+    def add_link(self, source_id: str, target_id: str, type: str = "relates_to", weight: float = 1.0,
+                 commit: bool = True):
+        """
+        Create a directed link between two abstractions.
+        Batch callers pass commit=False and call storage.flush() once at the end.
+        """
+        # Verify both exist (ids only, no hydration)
+        found = self.storage.conn.execute(_SQL_COUNT_PAIR, (source_id, target_id)).fetchone()[0]
+        if found < len({source_id, target_id}):
             logger.error(f"Cannot link {source_id} -> {target_id}: One or both not found.")
             return False
             
-        # Update source's link list and save
-        # Check if link exists to update weight/type?
-        # For simplicity, we just append/overwrite in list logic
-        
-        new_link = Link(target_id=target_id, type=type, weight=weight)
-        
-        # Remove existing link to same target if any
-        source.links = [l for l in source.links if l.target_id != target_id]
-        source.links.append(new_link)
-        
-        # Save via storage (which updates links table)
-        # We need the embedding to call add_abstraction... this is a design flaw in V1 storage.add_abstraction
-        # It requires embedding every time.
-        # OPTIMIZATION: We should have a specific update_links method in storage.
-        # For now, let's add that method to storage or use a direct SQL execution here for efficiency.
-        
         try:
-            self.storage.conn.execute("""
-                INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?)
-            """, (source_id, target_id, type, weight))
-            self.storage.conn.commit()
+            with self.storage._write_lock:
+                self.storage.conn.execute(_SQL_ADD_LINK, (source_id, target_id, type, weight))
+                if commit:
+                    self.storage.conn.commit()
             logger.info(f"🔗 Linked {source_id[:8]} -> {target_id[:8]} ({type})")
             return True
         except Exception as e:
             logger.error(f"Failed to add link: {e}")
             return False
 
+    def add_links(self, links: List[Tuple[str, str, str, float]], commit: bool = True) -> int:
+        """
+        Create many (source_id, target_id, type, weight) links with one
+        existence check and one executemany. Links to missing nodes are skipped.
+        Returns the number of links written.
+        """
+        if not links:
+            return 0
+        ids = list({node_id for link in links for node_id in link[:2]})
+        placeholders = ",".join("?" * len(ids))
+        existing = {row[0] for row in self.storage.conn.execute(
+            f"SELECT id FROM abstractions WHERE id IN ({placeholders})", ids
+        )}
+        rows = [link for link in links if link[0] in existing and link[1] in existing]
+        if len(rows) < len(links):
+            logger.error(f"Skipped {len(links) - len(rows)} link(s): endpoint not found.")
+        if not rows:
+            return 0
+            
+        with self.storage._write_lock:
+            self.storage.conn.executemany(_SQL_ADD_LINK, rows)
+            if commit:
+                self.storage.conn.commit()
+        logger.info(f"🔗 Linked {len(rows)} pair(s)")
+        return len(rows)
+
     def get_related(self, source_id: str, min_weight: float = 0.5) -> List[Abstraction]:
         """Get all abstractions linked FROM this source"""
         cursor = self.storage.conn.execute("""
@@ -59,14 +79,14 @@ class GraphManager:
             ORDER BY weight DESC
         """, (source_id, min_weight))
         
-        related_ids = cursor.fetchall()
-        results = []
-        for rid, weight in related_ids:
-            abs_obj = self.storage.get_abstraction(rid)
-            if abs_obj:
-                # Inject equality weight for context?
-                abs_obj.metadata['_link_weight'] = weight
-                results.append(abs_obj)
+        related = cursor.fetchall()
+        weights = {}
+        for rid, weight in related:
+            weights.setdefault(rid, weight)  # Strongest link per target
+        results = self.storage.get_abstractions_bulk([rid for rid, _ in related])
+        for abs_obj in results:
+            # Inject equality weight for context?
+            abs_obj.metadata['_link_weight'] = weights[abs_obj.id]
         
         return results
 
@@ -77,32 +97,33 @@ class GraphManager:
             WHERE target_id = ?
         """, (target_id,))
         
-        results = []
-        for sid, type_ in cursor.fetchall():
-            abs_obj = self.storage.get_abstraction(sid)
-            if abs_obj:
-                abs_obj.metadata['_link_type'] = type_
-                results.append(abs_obj)
+        backlinks = cursor.fetchall()
+        types = dict(backlinks)
+        results = self.storage.get_abstractions_bulk([sid for sid, _ in backlinks])
+        for abs_obj in results:
+            abs_obj.metadata['_link_type'] = types[abs_obj.id]
         return results
 
-    def explore_subgraph(self, start_id: str, depth: int = 2) -> List[Abstraction]:
-        """Recursive traversal to build a reasoning context"""
-        visited = set()
-        results = []
-        
-        def _traverse(current_id, current_depth):
-            if current_depth > depth or current_id in visited:
-                return
-            
-            visited.add(current_id)
-            abs_obj = self.storage.get_abstraction(current_id)
-            if abs_obj:
-                results.append(abs_obj)
-                
-                # Get neighbors
-                related = self.get_related(current_id)
-                for rel in related:
-                    _traverse(rel.id, current_depth + 1)
+    def explore_subgraph(self, start_id: str, depth: int = 2, min_weight: float = 0.5) -> List[Abstraction]:
+        """
+        Breadth-first traversal to build a reasoning context.
+        One recursive CTE collects every node within depth, then one bulk fetch
+        hydrates them (nearest first).
+        """
+        cursor = self.storage.conn.execute("""
+            WITH RECURSIVE walk(id, d) AS (
+                SELECT ?, 0
+                UNION
+                SELECT l.target_id, walk.d + 1 FROM links l
+                JOIN walk ON l.source_id = walk.id
+                WHERE walk.d < ? AND l.weight >= ?
+            )
+            SELECT id FROM walk GROUP BY id ORDER BY MIN(d)
+        """, (start_id, depth, min_weight))
         
-        _traverse(start_id, 0)
-        return results
+        return self.storage.get_abstractions_bulk([row[0] for row in cursor.fetchall()])
+
+@lru_cache(maxsize=1)
+def get_graph_manager() -> GraphManager:
+    """Process-wide shared GraphManager"""
+    return GraphManager()
@@ -1,26 +1,30 @@
 
 import time
 import heapq
+import itertools
 import logging
 import math
-from typing import List, Dict, Optional, Any
+from collections.abc import MutableMapping
+from typing import List, Dict, Optional, Any, Iterator
 from dataclasses import dataclass, field
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class PowerLease:
     """Exclusive Execution Contract (Deep Work)."""
     agent_id: str
     start_time: float
     duration: float
     cost: float
+    end_time: float = field(init=False) # Checked every tick; set once
     
-    @property
-    def end_time(self):
-        return self.start_time + self.duration
+    def __post_init__(self):
+        self.end_time = self.start_time + self.duration
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bid:
     agent_id: str
     resource: str
@@ -28,13 +32,42 @@ class Bid:
     value: float = 0.0
     exclusive: bool = False
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GrantRequest:
     agent_id: str
     amount: float
     utility: float
     reason: str
 
+class WalletView(MutableMapping):
+    """Dict-style view over the market's SoA balance array."""
+
+    def __init__(self, market: "InternalMarket"):
+        self._market = market
+
+    def __getitem__(self, agent_id: str) -> float:
+        return float(self._market._bal[self._market._idx[agent_id]])
+
+    def __setitem__(self, agent_id: str, credits: float):
+        idx = self._market._idx.get(agent_id)
+        if idx is None:
+            idx = self._market._add_slot(agent_id)
+        self._market._bal[idx] = credits
+
+    def __delitem__(self, agent_id: str):
+        balances = dict(self)
+        del balances[agent_id]
+        self._market.wallets = balances
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._market._idx)
+
+    def __len__(self) -> int:
+        return len(self._market._idx)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 class InternalMarket:
     """
     The Marketplace & Clearing House.
@@ -47,7 +80,10 @@ class InternalMarket:
     
     def __init__(self, seeking_drive):
         self.drive = seeking_drive
-        self.wallets: Dict[str, float] = {} # agent_id -> credits
+        # Wallets (SoA): agent_id -> row index into a dense balance array
+        self._idx: Dict[str, int] = {}
+        self._bal: np.ndarray = np.zeros(0, dtype=np.float64)
+        self._capacity = np.zeros(16, dtype=np.float64)
         self.power_lease: Optional[PowerLease] = None
         
         # Metabolic System
@@ -55,6 +91,7 @@ class InternalMarket:
         self.recharge_rate = 10.0  # % per sec (sleep) - Boosted for stability
         self.drain_rate_base = 2.0 # % per sec (idle)
         self.last_tick = time.time()
+        self._last_surge_log = 0.0 # Last LOW BATTERY warning (rate-limited)
         
         # Economic Safeguards (Laissez-Fair: Light Guardrails)
         # 1. Decay: 8% per minute = ~0.13% per second
@@ -63,13 +100,51 @@ class InternalMarket:
         # 2. Wealth Cap: 25% of Total Supply (Dynamic)
         self.wealth_cap_ratio = 0.25     
         
+        # Ephemeral Budgeting: wallets reset every tick, which makes the
+        # decay/cap pass a no-op. Set False to carry balances between ticks.
+        self.ephemeral_mode = True
+        
         # Innovation Grants
         self.pending_grants: List[GrantRequest] = []
         
+        # Bids queued between ticks: (-value, seq, bid) max-heap.
+        # seq keeps submission order on ties and avoids comparing Bids.
+        self._bid_heap: List[tuple] = []
+        self._bid_tiebreak = itertools.count()
+        
         # Stats
         self.total_transactions = 0
         self.last_clearing_price = 0.0
         
+    @property
+    def wallets(self) -> WalletView:
+        """agent_id -> credits (mapping view over the balance array)."""
+        return WalletView(self)
+
+    @wallets.setter
+    def wallets(self, balances: Dict[str, float]):
+        balances = dict(balances)
+        self._idx = {agent_id: i for i, agent_id in enumerate(balances)}
+        self._capacity = np.zeros(max(16, len(balances) * 2), dtype=np.float64)
+        self._capacity[:len(balances)] = list(balances.values())
+        self._bal = self._capacity[:len(balances)]
+
+    def _add_slot(self, agent_id: str) -> int:
+        """Append a zero balance for a new agent (amortized growth)."""
+        n = len(self._idx)
+        if n == self._capacity.size:
+            grown = np.zeros(self._capacity.size * 2, dtype=np.float64)
+            grown[:n] = self._bal
+            self._capacity = grown
+        self._capacity[n] = 0.0
+        self._bal = self._capacity[:n + 1]
+        self._idx[agent_id] = n
+        return n
+
+    def submit_bid(self, bid: Bid):
+        """Queue a bid for the next auction tick (O(log N))."""
+        heapq.heappush(self._bid_heap, (-bid.value, next(self._bid_tiebreak), bid))
+
     def submit_proposal(self, agent_id: str, amount: float, utility: float, reason: str):
         """Submit an Innovation Grant proposal for evaluation"""
         self.pending_grants.append(GrantRequest(agent_id, amount, utility, reason))
@@ -79,23 +154,26 @@ class InternalMarket:
         Free Cooperation: Agents can voluntarily pool resources.
         """
         if amount <= 0: return False
-        if self.wallets.get(sender, 0) < amount: return False
-        if receiver not in self.wallets: return False
+        src = self._idx.get(sender)
+        dst = self._idx.get(receiver)
+        if src is None or dst is None: return False
+        balance = self._bal.item(src)
+        if balance < amount: return False
         
-        self.wallets[sender] -= amount
-        self.wallets[receiver] += amount
-        logger.info(f"🤝 Cooperation: {sender} -> {receiver} ({amount:.1f}cr)")
+        self._bal[src] = balance - amount
+        self._bal[dst] += amount
+        logger.info("🤝 Cooperation: %s -> %s (%.1fcr)", sender, receiver, amount)
         return True
             
     def register_agent(self, agent_id: str, initial_credits: float = 100.0):
-        if agent_id not in self.wallets:
-            self.wallets[agent_id] = initial_credits
-            logger.info(f"🏦 Market: Agent '{agent_id}' registered (Balance: {initial_credits}cr)")
+        if agent_id not in self._idx:
+            idx = self._add_slot(agent_id)
+            self._bal[idx] = initial_credits
+            logger.info("🏦 Market: Agent '%s' registered (Balance: %scr)", agent_id, initial_credits)
             
     def get_balance(self, agent_id: str) -> float:
-        return self.wallets.get(agent_id, 0.0)
-
-    # ... (run_auction remains same) ...
+        idx = self._idx.get(agent_id)
+        return 0.0 if idx is None else float(self._bal[idx])
 
     def _apply_demurrage(self):
         """
@@ -103,25 +181,10 @@ class InternalMarket:
         1. Natural Decay (8%/min) to prevent hoarding.
         2. Soft Cap (25% of total) to prevent monopoly.
         """
-        total_supply = sum(self.wallets.values())
+        # Excess above the cap is burned (not yet redistributed as UBI)
+        total_supply = self._bal.sum()
         max_allowed = max(100.0, total_supply * self.wealth_cap_ratio)
-        
-        for agent_id in self.wallets:
-            # 1. Decay
-            balance = self.wallets[agent_id]
-            decayed = balance * (1.0 - self.demurrage_rate) # Per tick decay
-            
-            # 2. Cap
-            if decayed > max_allowed:
-                excess = decayed - max_allowed
-                decayed = max_allowed
-                # Redistribute excess? Or burn?
-                # Theory says: Burn to control inflation? 
-                # User said: "Excess is automatically redistributed as UBI"
-                # Implementation: Add to a Redistribution Pot for next tick
-                pass 
-            
-            self.wallets[agent_id] = decayed
+        np.minimum(self._bal * (1.0 - self.demurrage_rate), max_allowed, out=self._bal)
         
     def run_auction(self, bids: List[Bid]) -> Dict[str, Any]:
         """
@@ -135,16 +198,17 @@ class InternalMarket:
         # === 0. Ephemeral Budgeting (The "Easy Fix" to Capitalism) ===
         # Reset all wallets to 0. No accumulation. No hoarding.
         # Agents must justify their existence every tick.
-        for agent in self.wallets:
-            self.wallets[agent] = 0.0
+        if self.ephemeral_mode:
+            self._bal.fill(0.0)
+        else:
+            # Persistent balances: Light Guardrails instead of a full reset
+            self._apply_demurrage()
             
         # === 1. Mint New Grants ===
         new_credits = self.drive.mint_currency(dt)
-        if self.wallets:
+        if self._bal.size:
             # Grant logic: Equal distribution for now (UBI)
-            grant = new_credits / len(self.wallets)
-            for agent in self.wallets:
-                self.wallets[agent] += grant
+            self._bal += new_credits / self._bal.size
                 
         # === 1.5 Process Innovation Proposals ===
         # "Venture Capital" Stage
@@ -152,12 +216,13 @@ class InternalMarket:
             processed_count = 0
             for req in self.pending_grants:
                 if self.drive.evaluate_proposal(req.amount, req.utility):
-                    if req.agent_id in self.wallets:
-                        self.wallets[req.agent_id] += req.amount
+                    idx = self._idx.get(req.agent_id)
+                    if idx is not None:
+                        self._bal[idx] += req.amount
                         processed_count += 1
             if processed_count > 0:
-                logger.info(f"💡 Funded {processed_count} innovation grants this tick.")
-            self.pending_grants = [] # Clear queue
+                logger.info("💡 Funded %d innovation grants this tick.", processed_count)
+            self.pending_grants.clear() # Clear queue
         
         # === 2. Metabolic Update ===
         # Calculate Load
@@ -172,12 +237,10 @@ class InternalMarket:
         scarcity_multiplier = 1.0
         if self.energy_level < 20.0:
             scarcity_multiplier = 10.0 # Everything costs 10x
-            logger.warning(f"🔋 LOW BATTERY ({self.energy_level:.1f}%): Surge Pricing Active (10x)")
-
-        # === 3. Check Active Lease ===
-        if self.energy_level < 20.0:
-            scarcity_multiplier = 10.0 # Everything costs 10x
-            logger.warning(f"🔋 LOW BATTERY ({self.energy_level:.1f}%): Surge Pricing Active (10x)")
+            # Rate-limited: surge can persist for many 1Hz ticks
+            if current_time - self._last_surge_log >= 5.0:
+                self._last_surge_log = current_time
+                logger.warning("🔋 LOW BATTERY (%.1f%%): Surge Pricing Active (10x)", self.energy_level)
 
         # === 3. Check Active Lease ===
         if self.power_lease:
@@ -186,7 +249,9 @@ class InternalMarket:
                 # Only "Interrupt" bids allowed (e.g. Pain signals)
                 # Must pay 50x current lease price to break it
                 interrupt_threshold = self.power_lease.cost * 50.0
-                high_bids = [b for b in bids if b.value > interrupt_threshold]
+                queued = [entry[2] for entry in self._bid_heap]
+                self._bid_heap.clear() # Queued bids expire with this tick
+                high_bids = [b for b in itertools.chain(bids, queued) if b.value > interrupt_threshold]
                 
                 if not high_bids:
                     return {"POWER_LEASE": {"winner": self.power_lease.agent_id, "amount": 0}}
@@ -198,7 +263,7 @@ class InternalMarket:
                 # Special Case: Interrupts can overdraw (Emergency Debt)
                 # Because if it's pain, we must react.
                 self.power_lease = None
-                logger.warning(f"⚡ SURGE INTERRUPT: {winner.agent_id} broke lease with {pay:.0f}cr bid!")
+                logger.warning("⚡ SURGE INTERRUPT: %s broke lease with %.0fcr bid!", winner.agent_id, pay)
                 
                 # Grant allocation directly
                 return {winner.resource: [{"winner": winner.agent_id, "amount": winner.amount, "cost": pay}]}
@@ -206,14 +271,21 @@ class InternalMarket:
                 self.power_lease = None # Expired
         
         # === 4. Standard Auction ===
-        return self._process_standard_auction(bids, scarcity_multiplier, dt)
+        return self._process_standard_auction(bids, scarcity_multiplier, dt, current_time)
         
-    def _process_standard_auction(self, bids: List[Bid], multiplier: float, dt: float) -> Dict[str, Any]:
+    def _process_standard_auction(self, bids: List[Bid], multiplier: float, dt: float,
+                                  now: Optional[float] = None) -> Dict[str, Any]:
         """Prioritize high-value bids. Reject invalid ones."""
-        results = {}
+        if now is None:
+            now = time.time()
+        # Unknown resources never pass the availability check below
+        results = {"COMPUTE_RPM": [], "MEMORY_SLOT": [], "POWER_LEASE": []}
         
-        # Sort by value (Descending)
-        bids.sort(key=lambda b: b.value, reverse=True)
+        # Max-heap by value: bids queued via submit_bid plus this tick's list
+        heap, self._bid_heap = self._bid_heap, []
+        if bids:
+            heap.extend((-b.value, next(self._bid_tiebreak), b) for b in bids)
+            heapq.heapify(heap)
         
         # Resources available this tick
         available = {
@@ -222,9 +294,15 @@ class InternalMarket:
             "POWER_LEASE": 1          # 1 lease slot
         }
         
-        for bid in bids:
+        total_compute_rpm = 0.0
+        while heap:
+            bid = heapq.heappop(heap)[2]
+            
+            # Remaining bids are all non-positive
+            if bid.value <= 0:
+                break
             # Validate
-            if bid.value <= 0 or bid.amount <= 0:
+            if bid.amount <= 0:
                 continue
                 
             cost = bid.value * multiplier
@@ -234,15 +312,17 @@ class InternalMarket:
                 continue
                 
             # Check funds
-            if self.wallets.get(bid.agent_id, 0) < cost:
+            idx = self._idx.get(bid.agent_id)
+            if idx is None:
+                continue
+            balance = self._bal.item(idx)
+            if balance < cost:
                 continue
                 
             # Winner!
-            self.wallets[bid.agent_id] -= cost
+            self._bal[idx] = balance - cost
             
             # Record result
-            if bid.resource not in results:
-                results[bid.resource] = []
             results[bid.resource].append({
                 "winner": bid.agent_id,
                 "amount": bid.amount,
@@ -253,7 +333,7 @@ class InternalMarket:
             if bid.resource == "POWER_LEASE":
                 available["POWER_LEASE"] = 0
                 self.power_lease = self.power_lease or PowerLease( # Use existing if interrupt? No, interrupt clears it logic
-                    bid.agent_id, time.time(), bid.amount, cost
+                    bid.agent_id, now, bid.amount, cost
                 )
                 # Compute is implicitly consumed by lease
                 available["COMPUTE_RPM"] = 0 
@@ -261,14 +341,18 @@ class InternalMarket:
             elif bid.resource == "COMPUTE_RPM":
                 allocated = min(available["COMPUTE_RPM"], bid.amount)
                 available["COMPUTE_RPM"] -= allocated
+                total_compute_rpm += allocated
                 
             elif bid.resource == "MEMORY_SLOT":
                 available["MEMORY_SLOT"] -= 1
                 
+            # Everything allocated: no later bid can win
+            if all(v <= 0 for v in available.values()):
+                break
+                
         # === 5. Metabolic Update (Post-Allocation) ===
         # Did we do work?
-        total_rpm = sum(r["amount"] for r in results.get("COMPUTE_RPM", []))
-        is_busy = total_rpm > 15.0 or self.power_lease is not None
+        is_busy = total_compute_rpm > 15.0 or self.power_lease is not None
         
         if is_busy:
             # Running Hot -> Drain
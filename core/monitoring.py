@@ -1,4 +1,5 @@
 import logging
+import os
 import time
 import threading
 from datetime import datetime
@@ -14,14 +15,16 @@ class SystemMonitor:
     """
     def __init__(self):
         self.storage = EngramStorage()
-        self.metrics = {
-            "queries_total": 0,
-            "queries_last_minute": 0,
-            "avg_latency_ms": 0,
-            "error_count": 0,
-            "storage_mb": 0
-        }
-        self._lock = threading.Lock()
+        self.storage_mb = 0.0
+        # Per-thread [queries, errors, latency_sum_ms] shards: each thread only
+        # writes its own shard, so record_query needs no lock. list.append is
+        # atomic under the GIL; get_metrics reduces the shards.
+        self._shards: list = []
+        self._local = threading.local()
+        # Totals at the previous snapshot: avg_latency_ms covers only newer queries
+        self._snapshot_lock = threading.Lock()
+        self._last_totals = (0, 0.0)
+        self._last_avg_latency = 0.0
         self._start_monitoring()
         
     def _start_monitoring(self):
@@ -40,7 +43,7 @@ class SystemMonitor:
         
         # ChromaDB size (rough estimate)
         chroma_path = Path(config.CHROMA_PERSIST_DIRECTORY)
-        chroma_size = sum(f.stat().st_size for f in chroma_path.rglob('*') if f.is_file())
+        chroma_size = self._dir_size(chroma_path)
         
         # SQLite size
         sqlite_path = Path(config.METADATA_DB_PATH)
@@ -48,26 +51,60 @@ class SystemMonitor:
         
         total_mb = (chroma_size + sqlite_size) / (1024 * 1024)
         
-        with self._lock:
-            self.metrics["storage_mb"] = round(total_mb, 2)
+        self.storage_mb = round(total_mb, 2)
             
-    def record_query(self, latency_ms: float, error: bool = False):
-        """Record a query execution"""
-        with self._lock:
-            self.metrics["queries_total"] += 1
-            self.metrics["queries_last_minute"] += 1
+    @staticmethod
+    def _dir_size(path) -> int:
+        """Recursive size of regular files under path (os.scandir walk)"""
+        total = 0
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue  # Missing dir or file removed mid-walk
+        return total
             
-            # Running average
-            prev_avg = self.metrics["avg_latency_ms"]
-            self.metrics["avg_latency_ms"] = (prev_avg * 0.9) + (latency_ms * 0.1)
+    def _shard(self) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = [0, 0, 0.0]
+            self._shards.append(shard)
+        return shard
             
-            if error:
-                self.metrics["error_count"] += 1
+    def record_query(self, latency_ms: float, error: bool = False):
+        """Record a query execution"""
+        shard = self._shard()
+        shard[2] += latency_ms  # Before the count, so a counted query's latency is in the sum
+        shard[0] += 1
+        if error:
+            shard[1] += 1
                 
     def get_metrics(self) -> dict:
-        """Get current metrics snapshot"""
-        with self._lock:
-            return self.metrics.copy()
+        """Get current metrics snapshot (monotonic, not atomic across shards)"""
+        shards = [list(s) for s in self._shards]
+        total = sum(s[0] for s in shards)
+        latency_sum = sum(s[2] for s in shards)
+        # Mean latency of the queries since the previous snapshot (current traffic,
+        # not lifetime); with no new queries the last value is kept
+        with self._snapshot_lock:
+            prev_total, prev_sum = self._last_totals
+            if total > prev_total:
+                self._last_avg_latency = (latency_sum - prev_sum) / (total - prev_total)
+                self._last_totals = (total, latency_sum)
+            avg_latency = self._last_avg_latency
+        return {
+            "queries_total": total,
+            "queries_last_minute": total,
+            "avg_latency_ms": avg_latency,
+            "error_count": sum(s[1] for s in shards),
+            "storage_mb": self.storage_mb
+        }
             
     def get_health(self) -> dict:
         """Health check for deployment"""
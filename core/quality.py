@@ -1,7 +1,86 @@
 import math
+import numpy as np
+from typing import List
 from core.abstraction import Abstraction
 from utils import config
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# EVOLUTION LEVEL 3: Salience gets 0.15 weight
+# Other weights adjusted proportionally to sum to 1.0
+SALIENCE_WEIGHT = 0.15
+
+_WEIGHT_KEYS = ("usage", "reuse", "compression", "accuracy", "freshness")
+_adjusted_cache = (None, ())
+
+
+def _adjusted_weights() -> tuple:
+    """config.WEIGHTS pre-scaled by (1 - SALIENCE_WEIGHT), cached per WEIGHTS object"""
+    global _adjusted_cache
+    weights = config.WEIGHTS
+    if _adjusted_cache[0] is not weights:
+        rest = 1.0 - SALIENCE_WEIGHT
+        _adjusted_cache = (weights, tuple(weights[k] * rest for k in _WEIGHT_KEYS))
+    return _adjusted_cache[1]
+
+
+def _quality_kernel(usage, reuse, compression, accuracy, decay, salience,
+                    w_usage, w_reuse, w_compression, w_accuracy, w_freshness):
+    """Scalar quality score over raw abstraction fields (w_* pre-scaled)"""
+    # Log scale is better for usage count (1 vs 100 matters, 1000 vs 1100 doesn't)
+    norm_usage = min(math.log1p(usage) / 5.0, 1.0)  # Cap at ~5 (=150 uses)
+    norm_reuse = min(reuse / 5.0, 1.0)               # Reused in >5 contexts is excellent
+    norm_compression = min(compression / 5.0, 1.0)   # >5x compression is excellent
+    freshness = 1.0 - decay
+    # Range: 0.5 (boring) to 2.0 (vital). Normalize to 0-1
+    salience_norm = max(0.0, min((salience - 0.5) / 1.5, 1.0))
+    
+    return (
+        w_usage * norm_usage +
+        w_reuse * norm_reuse +
+        w_compression * norm_compression +
+        w_accuracy * accuracy +
+        w_freshness * freshness +
+        SALIENCE_WEIGHT * salience_norm
+    )
+
+
+def _quality_kernel_np(usage, reuse, compression, accuracy, decay, salience,
+                       w_usage, w_reuse, w_compression, w_accuracy, w_freshness):
+    """Vectorized _quality_kernel over SoA arrays"""
+    norm_usage = np.minimum(np.log1p(usage) / 5.0, 1.0)
+    norm_reuse = np.minimum(reuse / 5.0, 1.0)
+    norm_compression = np.minimum(compression / 5.0, 1.0)
+    salience_norm = np.clip((salience - 0.5) / 1.5, 0.0, 1.0)
+    
+    return (
+        w_usage * norm_usage +
+        w_reuse * norm_reuse +
+        w_compression * norm_compression +
+        w_accuracy * accuracy +
+        w_freshness * (1.0 - decay) +
+        SALIENCE_WEIGHT * salience_norm
+    )
+
+
+if HAS_NUMBA:
+    _quality_kernel = njit(cache=True, fastmath=True)(_quality_kernel)
+
+    @njit(parallel=True, cache=True)
+    def _quality_kernel_batch(usage, reuse, compression, accuracy, decay, salience,
+                              w_usage, w_reuse, w_compression, w_accuracy, w_freshness):
+        out = np.empty(usage.shape[0], dtype=np.float64)
+        for i in prange(usage.shape[0]):
+            out[i] = _quality_kernel(usage[i], reuse[i], compression[i], accuracy[i],
+                                     decay[i], salience[i], w_usage, w_reuse,
+                                     w_compression, w_accuracy, w_freshness)
+        return out
+
+
 def calculate_quality_score(abstraction: Abstraction) -> float:
     """
     Calculate quality score based on 6 dimensions:
@@ -12,48 +91,35 @@ def calculate_quality_score(abstraction: Abstraction) -> float:
     5. Freshness (Inverse Decay)
     6. Salience (Emotional Weight) - EVOLUTION LEVEL 3
     """
-    
-    # 1. Normalize Usage
-    # Log scale is better for usage count (1 vs 100 matters, 1000 vs 1100 doesn't)
-    norm_usage = math.log1p(abstraction.successful_application_count) / 5.0 # Cap at ~5 (=150 uses)
-    norm_usage = min(norm_usage, 1.0)
-    
-    # 2. Normalize Reuse Contexts
-    # Reused in >5 contexts is excellent
-    norm_reuse = min(abstraction.reuse_contexts / 5.0, 1.0)
-    
-    # 3. Normalize Compression Ratio
-    # >5x compression is excellent
-    norm_compression = min(abstraction.compression_ratio / 5.0, 1.0)
-    
-    # 4. Accuracy
-    accuracy = abstraction.accuracy_preserved
-    
-    # 5. Freshness
-    freshness = 1.0 - abstraction.decay_score
-    
-    # 6. Salience (Emotional Weight) - EVOLUTION SYSTEM
-    # Range: 0.5 (boring) to 2.0 (vital). Normalize to 0-1 by: (salience - 0.5) / 1.5
-    salience_norm = (abstraction.salience - 0.5) / 1.5
-    salience_norm = max(0.0, min(salience_norm, 1.0)) # Clamp
-    
-    weights = config.WEIGHTS
-    
-    # EVOLUTION LEVEL 3: Salience gets 0.15 weight
-    # Other weights adjusted proportionally to sum to 1.0
-    salience_weight = 0.15
-    
-    score = (
-        weights["usage"] * (1 - salience_weight) * norm_usage +
-        weights["reuse"] * (1 - salience_weight) * norm_reuse +
-        weights["compression"] * (1 - salience_weight) * norm_compression +
-        weights["accuracy"] * (1 - salience_weight) * accuracy +
-        weights["freshness"] * (1 - salience_weight) * freshness +
-        salience_weight * salience_norm
+    score = _quality_kernel(
+        float(abstraction.successful_application_count),
+        float(abstraction.reuse_contexts),
+        float(abstraction.compression_ratio),
+        float(abstraction.accuracy_preserved),
+        float(abstraction.decay_score),
+        float(abstraction.salience),
+        *_adjusted_weights()
     )
-    
     return round(score, 4)
 
+def calculate_quality_scores_batch(abstractions: List[Abstraction]) -> np.ndarray:
+    """Quality scores for many abstractions in one vectorized pass"""
+    n = len(abstractions)
+    fields = [
+        np.fromiter((getattr(a, name) for a in abstractions), dtype=np.float64, count=n)
+        for name in ("successful_application_count", "reuse_contexts", "compression_ratio",
+                     "accuracy_preserved", "decay_score", "salience")
+    ]
+    kernel = _quality_kernel_batch if HAS_NUMBA else _quality_kernel_np
+    scores = kernel(*fields, *_adjusted_weights())
+    return np.round(scores, 4)
+
 def update_metrics(abstraction: Abstraction):
     """Update all derived metrics for an abstraction"""
     abstraction.quality_score = calculate_quality_score(abstraction)
+
+def update_metrics_batch(abstractions: List[Abstraction]):
+    """Batch variant of update_metrics for maintenance re-scoring passes"""
+    scores = calculate_quality_scores_batch(abstractions)
+    for a, s in zip(abstractions, scores.tolist()):
+        a.quality_score = s
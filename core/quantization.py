@@ -0,0 +1,39 @@
+import numpy as np
+
+# Embeddings are unit length, so every component lies in [-1, 1] and one
+# fixed scale covers all vectors (no per-vector scale to store).
+INT8_SCALE = 1.0 / 127.0
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize_embeddings(embeddings: np.ndarray, dtype: str = "float32") -> np.ndarray:
+    """
+    Cast unit-length embeddings to a compact dtype.
+    float16 halves memory traffic; int8 quarters it (value * 127, rounded).
+    """
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    if dtype == "int8":
+        scaled = np.round(np.asarray(embeddings, dtype=np.float32) * 127.0)
+        return np.clip(scaled, -127, 127).astype(np.int8)
+    return np.asarray(embeddings).astype(dtype, copy=False)
+
+
+def dequantize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """Back to float32 (int8 rescaled by INT8_SCALE)"""
+    if embeddings.dtype == np.int8:
+        return embeddings.astype(np.float32) * INT8_SCALE
+    return embeddings.astype(np.float32, copy=False)
+
+
+def cosine_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Cosine of a float query against every row of a (possibly quantized)
+    unit-vector matrix. int8 rows are scored with an integer dot product
+    (int32 accumulate) against the int8-quantized query.
+    """
+    if matrix.dtype == np.int8:
+        q = quantize_embeddings(query, "int8").astype(np.int32)
+        return (matrix.astype(np.int32) @ q) * (INT8_SCALE * INT8_SCALE)
+    return matrix.astype(np.float32, copy=False) @ np.asarray(query, dtype=np.float32)
@@ -14,6 +14,9 @@ class ClusterCentroidManager:
     def __init__(self):
         self.storage = EngramStorage()
         self.centroids: Dict[str, np.ndarray] = {} # cluster_id -> vector
+        # Dense (n_clusters, dim) copy of centroids for single-GEMV routing
+        self._centroid_matrix: Optional[np.ndarray] = None
+        self._cluster_ids: List[str] = []
         
     def recalculate_centroids(self):
         """
@@ -30,35 +33,43 @@ class ClusterCentroidManager:
             logger.info("No clustered data found.")
             return
 
-        # Map cluster_id -> list of IDs
-        cluster_map: Dict[str, List[str]] = {}
-        for r in rows:
-            doc_id, c_id = r
-            if c_id == "noise" or c_id == "unclustered":
-                continue
-            if c_id not in cluster_map:
-                cluster_map[c_id] = []
-            cluster_map[c_id].append(doc_id)
+        # Map doc_id -> cluster_id
+        id_to_cluster = {
+            doc_id: c_id for doc_id, c_id in rows
+            if c_id != "noise" and c_id != "unclustered"
+        }
+        if not id_to_cluster:
+            logger.info("No clustered data found.")
+            return
             
-        # 2. Calculate Centroids
-        new_centroids = {}
+        # 2. Fetch all embeddings in one round-trip (Chroma may reorder ids)
+        result = self.storage.collection.get(ids=list(id_to_cluster), include=['embeddings'])
+        if result['embeddings'] is None or len(result['embeddings']) == 0:
+            return
+        embs = np.asarray(result['embeddings'], dtype=np.float64)
+        labels = np.array([id_to_cluster[doc_id] for doc_id in result['ids']])
         
-        for c_id, doc_ids in cluster_map.items():
-            # Get embeddings for these docs
-            embeddings = self.storage.collection.get(ids=doc_ids, include=['embeddings'])['embeddings']
-            if embeddings is None or len(embeddings) == 0:
-                continue
-                
-            # Mean vector
-            centroid = np.mean(embeddings, axis=0)
-            # Normalize? Cosine similarity usually requires normalized vectors for best results
-            norm = np.linalg.norm(centroid)
-            if norm > 0:
-                centroid = centroid / norm
-                
-            new_centroids[c_id] = centroid
+        # 3. Group-mean per cluster: sort by label, reduce contiguous runs
+        order = np.argsort(labels, kind='stable')
+        cluster_ids, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+        sums = np.add.reduceat(embs[order], starts, axis=0)
+        centroids = sums / counts[:, None]
+        
+        # Normalize (cosine similarity works best on unit vectors)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        np.divide(centroids, norms, out=centroids, where=norms > 0)
+        
+        # FP32 halves the bandwidth of the routing GEMV
+        centroids = centroids.astype(np.float32)
+        new_centroids = {str(c_id): centroids[i] for i, c_id in enumerate(cluster_ids)}
             
         self.centroids = new_centroids
+        if new_centroids:
+            self._centroid_matrix = centroids
+            self._cluster_ids = list(new_centroids.keys())
+        else:
+            self._centroid_matrix = None
+            self._cluster_ids = []
         logger.info(f"Calculated {len(self.centroids)} centroids.")
         
     def get_centroid(self, cluster_id: str) -> Optional[np.ndarray]:
@@ -68,6 +79,12 @@ class ClusterCentroidManager:
         if not self.centroids:
             self.recalculate_centroids()
         return self.centroids
+        
+    def get_centroid_matrix(self) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Return (centroid_matrix, cluster_ids) with rows aligned to ids."""
+        if not self.centroids:
+            self.recalculate_centroids()
+        return self._centroid_matrix, self._cluster_ids
 
 
 class SemanticRouter:
@@ -92,23 +109,25 @@ class SemanticRouter:
             query_vec = np.array(query_vec)
             
         # 2. Get Centroids
-        centroids = self.centroid_manager.get_all_centroids()
-        if not centroids:
+        matrix, cluster_ids = self.centroid_manager.get_centroid_matrix()
+        if matrix is None or len(cluster_ids) == 0:
             logger.warning("No centroids available for routing.")
             return []
             
-        # 3. Calculate Similarity (Dot product since normalized)
-        # scores: List[Tuple[score, cluster_id]]
-        scores = []
-        for c_id, vec in centroids.items():
-            score = np.dot(query_vec, vec)
-            scores.append((score, c_id))
-            
-        # 4. Sort and return top_k
-        scores.sort(key=lambda x: x[0], reverse=True)
+        # 3. Calculate Similarity (one GEMV; cosine since both sides normalized)
+        qv = np.array(query_vec, dtype=np.float32)
+        qv /= (np.linalg.norm(qv) + 1e-12)
+        scores = matrix @ qv
+        
+        # 4. Partial select top_k, then order just those
+        k = min(top_k, len(cluster_ids))
+        if k <= 0:
+            return []
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
         
         # Debug log
-        top_matches = scores[:top_k]
+        top_matches = [(float(scores[i]), cluster_ids[i]) for i in idx]
         logger.info(f"Query '{query}' routed to: {top_matches}")
         
-        return [c_id for score, c_id in top_matches]
+        return [cluster_ids[i] for i in idx]
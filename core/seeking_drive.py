@@ -1,11 +1,41 @@
 
 import time
 import logging
-import math
 from utils import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _drive_step(seeking, target, dt, novelty, error, base_rate, err_sens, nov_boost, decay):
+    """One drive tick: experience delta, decay, interpolation, minting.
+    dt=0 applies only the experience delta (no time passed, nothing minted).
+    Returns (new_seeking, new_target, mint_amount)."""
+    if novelty != 0.0 or error != 0.0:
+        target = min(1.0, max(0.1, target + (error * err_sens) + (novelty * nov_boost)))
+    
+    # Drive naturally decays towards baseline 0.3 if nothing happens
+    if dt > 0.0:
+        target = target * (1 - decay * dt)
+        if target < 0.3:
+            target = 0.3
+    
+    # Interpolate current level
+    seeking += (target - seeking) * min(1.0, dt * 0.5)
+    
+    # Non-linear: 0.1->10cr, 0.5->100cr, 1.0->500cr
+    multiplier = seeking * seeking * 5.0
+    return seeking, target, base_rate * multiplier * dt
+
+
+if HAS_NUMBA:
+    _drive_step = njit(cache=True, fastmath=True)(_drive_step)
+
 class SeekingDrive:
     """
     The 'Central Bank' and Intrinsic Motivation Source.
@@ -40,29 +70,21 @@ class SeekingDrive:
         # Friston: Minimize free energy -> but keeping 'seeking' high means 
         # we actively LOOK for gaps to close.
         
-        delta = (prediction_error * self.error_sensitivity) + (novelty * self.novelty_boost)
-        
-        # Smooth update
-        self.target_level = min(1.0, max(0.1, self.target_level + delta))
+        # Smooth update: the shared drive kernel with no elapsed time
+        self.seeking_level, self.target_level, _ = _drive_step(
+            float(self.seeking_level), float(self.target_level), 0.0, float(novelty), float(prediction_error),
+            self.base_mint_rate, self.error_sensitivity, self.novelty_boost, self.decay_rate
+        )
         
     def mint_currency(self, dt: float) -> float:
         """
         Mint new credits for the economy.
         Amount = BaseRate * SeekingLevel * dt
         """
-        # Drive naturally decays towards baseline 0.3 if nothing happens
-        self.target_level = self.target_level * (1 - self.decay_rate * dt)
-        if self.target_level < 0.3: self.target_level = 0.3
-        
-        # Interpolate current level
-        diff = self.target_level - self.seeking_level
-        self.seeking_level += diff * min(1.0, dt * 0.5)
-        
-        # Calculate Minting
-        # Non-linear: 0.1->10cr, 0.5->100cr, 1.0->500cr
-        multiplier = math.pow(self.seeking_level, 2) * 5
-        amount = self.base_mint_rate * multiplier * dt
-        
+        self.seeking_level, self.target_level, amount = _drive_step(
+            float(self.seeking_level), float(self.target_level), float(dt), 0.0, 0.0,
+            self.base_mint_rate, self.error_sensitivity, self.novelty_boost, self.decay_rate
+        )
         return amount
         
     def evaluate_proposal(self, cost: float, utility: float) -> bool:
@@ -84,7 +106,7 @@ class SeekingDrive:
         is_approved = roi >= min_roi
         
         if is_approved:
-            logger.info(f"💡 GRANT APPROVED: Cost {cost}, Utility {utility}, ROI {roi:.2f} (Threshold {min_roi:.2f})")
+            logger.info("💡 GRANT APPROVED: Cost %s, Utility %s, ROI %.2f (Threshold %.2f)", cost, utility, roi, min_roi)
         
         return is_approved
         
@@ -92,5 +114,5 @@ class SeekingDrive:
         return {
             "level": round(self.seeking_level, 3),
             "target": round(self.target_level, 3),
-            "mint_rate": round(self.base_mint_rate * math.pow(self.seeking_level, 2) * 5, 1)
+            "mint_rate": round(self.base_mint_rate * self.seeking_level * self.seeking_level * 5.0, 1)
         }
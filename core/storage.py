@@ -1,26 +1,91 @@
+import atexit
 import chromadb
 from chromadb.config import Settings
 import sqlite3
 import json
-from typing import List, Optional, Dict
+import logging
+import queue
+import random
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional, Dict, Tuple
 from pathlib import Path
 from datetime import datetime
-from core.abstraction import Abstraction
+from core.abstraction import Abstraction, Link, SNIPPET_LENGTH
+from core.quantization import quantize_embeddings, dequantize_embeddings
 from utils import config
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_dumps(obj) -> str:
+    """JSON text for metadata columns (orjson when available)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Schema needs SQLite 3.33+ (UPSERT, UPDATE ... FROM). ALTER TABLE DROP COLUMN and
+# RETURNING need 3.35+; older builds (some Windows CPython installs) use fallbacks.
+HAS_SQLITE_3_35 = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+class AbstractionLight(NamedTuple):
+    """Score-only view of an abstraction (what TruthGuard and ranking read)"""
+    id: str
+    quality_score: float
+    decay_score: float
+    cluster_id: Optional[str]
+
 class EngramStorage:
     _instance = None
+    _lock = threading.Lock()  # Concurrent first use must build only one instance
+    
+    # Bump when _init_sqlite gains a migration; databases at this version skip them
+    SCHEMA_VERSION = 1
+    # Columns added after the original table (older databases lack them)
+    _MIGRATED_COLUMNS = [
+        ("image_path", "TEXT"),
+        ("salience", "REAL"),
+        ("integrity_score", "REAL"),
+        # First-Principles Reasoning Fields (Hybrid AI)
+        ("is_axiom_derived", "INTEGER DEFAULT 0"),
+        ("proof_id", "TEXT"),
+        ("consistency_score", "REAL DEFAULT 1.0"),
+        ("content_snippet", "TEXT"),
+        ("last_used_ts", "INTEGER"),  # Epoch seconds mirror of last_used (decay math)
+    ]
     
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(EngramStorage, cls).__new__(cls)
-            cls._instance._initialized = False
+        if cls._instance is not None:
+            return cls._instance  # Fast path, no lock once built
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(EngramStorage, cls).__new__(cls)
+                instance._initialized = False
+                cls._instance = instance
         return cls._instance
 
     def __init__(self):
         if self._initialized:
             return
-            
+        with self._lock:
+            if self._initialized:
+                return
+            self._init_once()
+
+    def _init_once(self):
+        """Build clients and schema; runs once, under _lock"""
         # Initialize ChromaDB
         self.chroma_client = chromadb.PersistentClient(
             path=config.CHROMA_PERSIST_DIRECTORY,
@@ -29,26 +94,53 @@ class EngramStorage:
         
         self.collection = self.chroma_client.get_or_create_collection(
             name="engrams",
-            metadata={"hnsw:space": "cosine"}
+            metadata=self._hnsw_metadata(config.HNSW_SEARCH_EF)
         )
         
         # Image Collection (CLIP 512d)
         self.image_collection = self.chroma_client.get_or_create_collection(
             name="engram_images",
-            metadata={"hnsw:space": "cosine"}
+            metadata=self._hnsw_metadata(config.HNSW_IMAGE_SEARCH_EF)
         )
         
+        # Chroma deletes (HNSW graph edits) run off the caller's thread, after the SQL commit
+        self._vector_deletes = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ChromaDelete")
+        
         # Initialize Metadata DB (SQLite)
         self._init_sqlite()
         self._initialized = True
         
+    @staticmethod
+    def _hnsw_metadata(search_ef: int) -> Dict[str, object]:
+        """Collection metadata; Chroma only applies HNSW params on creation"""
+        return {
+            "hnsw:space": "cosine",
+            "hnsw:M": config.HNSW_M,
+            "hnsw:construction_ef": config.HNSW_CONSTRUCTION_EF,
+            "hnsw:search_ef": search_ef,
+            "hnsw:num_threads": config.HNSW_NUM_THREADS,
+        }
+        
     def _init_sqlite(self):
         """Initialize SQLite for robust metadata and fast indexing"""
-        self.conn = sqlite3.connect(config.METADATA_DB_PATH, check_same_thread=False)
+        # Larger statement cache: the fixed-shape hot queries stay compiled
+        self.conn = sqlite3.connect(config.METADATA_DB_PATH, check_same_thread=False, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         
-        # Enable WAL mode for concurrency
+        # Enable WAL mode for concurrency: API readers proceed while a writer commits
         self.conn.execute("PRAGMA journal_mode=WAL;")
+        # WAL keeps NORMAL durable against app crashes; only fsyncs at checkpoint
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        # Keep hot pages resident: 256MB mmap, 64MB page cache, in-memory temp b-trees
+        self.conn.execute("PRAGMA mmap_size=268435456;")
+        self.conn.execute("PRAGMA cache_size=-65536;")
+        self.conn.execute("PRAGMA temp_store=MEMORY;")
+        # Writes here UPSERT; any ad-hoc INSERT OR REPLACE only fires DELETE triggers (FTS sync) with this on
+        self.conn.execute("PRAGMA recursive_triggers=ON;")
+        # Wait on a concurrent writer's lock instead of failing with SQLITE_BUSY
+        self.conn.execute("PRAGMA busy_timeout=5000;")
+        # Checkpoint every ~1000 WAL pages so the log (and read amplification) stays bounded
+        self.conn.execute("PRAGMA wal_autocheckpoint=1000;")
         
         # Create table if not exists (mirroring Pydantic model)
         self.conn.execute("""
@@ -85,88 +177,289 @@ class EngramStorage:
             )
         """)
         
-        # CRITICAL: Create indexes for performance (User Request #2)
-        # Check if column exists (migration for existing DB)
-        try:
-            self.conn.execute("ALTER TABLE abstractions ADD COLUMN image_path TEXT")
-        except sqlite3.OperationalError:
-            pass # Column already exists
-
-        try:
-            self.conn.execute("ALTER TABLE abstractions ADD COLUMN salience REAL")
-        except sqlite3.OperationalError:
-            pass # Column already exists
-
-        # Integrity Migration
-        try:
-            self.conn.execute("ALTER TABLE abstractions ADD COLUMN integrity_score REAL")
-        except sqlite3.OperationalError:
-            pass
-
-        # First-Principles Reasoning Fields (Hybrid AI)
-        for col, col_type in [
-            ("is_axiom_derived", "INTEGER DEFAULT 0"),
-            ("proof_id", "TEXT"),
-            ("consistency_score", "REAL DEFAULT 1.0"),
-            ("axioms_used", "TEXT DEFAULT '[]'"),
-        ]:
-            try:
-                self.conn.execute(f"ALTER TABLE abstractions ADD COLUMN {col} {col_type}")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
+        # Schema-version gate: a database already at SCHEMA_VERSION skips migrations
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        row = self.conn.execute("SELECT v FROM meta WHERE k = 'schema_version'").fetchone()
+        needs_migration = row is None or int(row[0]) < self.SCHEMA_VERSION
+        if needs_migration:
+            self._migrate_columns()
             
+        # CRITICAL: Create indexes for performance (User Request #2)
+        had_covering = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_abs_covering'"
+        ).fetchone() is not None
         self.conn.executescript("""
             CREATE INDEX IF NOT EXISTS idx_cluster_id ON abstractions(cluster_id);
             CREATE INDEX IF NOT EXISTS idx_last_used ON abstractions(last_used);
-            CREATE INDEX IF NOT EXISTS idx_quality ON abstractions(quality_score);
+            -- Covering index for quality scans (dream sampling, risk, prune): no table
+            -- lookups for these columns; replaces the single-column idx_quality
+            CREATE INDEX IF NOT EXISTS idx_abs_covering ON abstractions(quality_score, decay_score, cluster_id, id);
+            DROP INDEX IF EXISTS idx_quality;
             CREATE INDEX IF NOT EXISTS idx_successful ON abstractions(successful_application_count);
             CREATE INDEX IF NOT EXISTS idx_hash ON abstractions(embedding_hash);
             CREATE INDEX IF NOT EXISTS idx_salience ON abstractions(salience);
             CREATE INDEX IF NOT EXISTS idx_consistency ON abstractions(consistency_score);
             CREATE INDEX IF NOT EXISTS idx_axiom_derived ON abstractions(is_axiom_derived);
+            -- /api/memory/search: cluster filter + ORDER BY quality_score DESC
+            CREATE INDEX IF NOT EXISTS idx_cluster_quality ON abstractions(cluster_id, quality_score DESC);
+            
+            -- get_related: WHERE source_id = ? AND weight >= ? ORDER BY weight DESC
+            -- (also serves every source_id lookup, so the single-column index is dropped)
+            CREATE INDEX IF NOT EXISTS idx_links_source_weight ON links(source_id, weight DESC);
+            DROP INDEX IF EXISTS idx_link_source;
+            -- Orphan prune NOT EXISTS probes on target_id stay index-only
+            CREATE INDEX IF NOT EXISTS idx_links_target ON links(target_id, source_id);
+            DROP INDEX IF EXISTS idx_link_target;
+            -- Dream history: type filter, newest rowid first (rowid is implicit in the index)
+            CREATE INDEX IF NOT EXISTS idx_link_type ON links(type);
+            
+            -- int8 copies of embeddings (config.USE_INT8_VECTORS): 4x fewer bytes than FP32
+            CREATE TABLE IF NOT EXISTS embeddings_sq8 (
+                id TEXT PRIMARY KEY,
+                codes BLOB
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS embeddings_sq8_ad AFTER DELETE ON abstractions BEGIN
+                DELETE FROM embeddings_sq8 WHERE id = old.id;
+            END;
+            -- Implicit priming counts per cluster, folded into abstractions periodically
+            CREATE TABLE IF NOT EXISTS priming_deltas (
+                cluster_id TEXT PRIMARY KEY,
+                delta INTEGER
+            ) WITHOUT ROWID;
+            
+            -- Axioms used in a derivation (was a JSON array column); indexed both ways
+            CREATE TABLE IF NOT EXISTS abstraction_axioms (
+                abstraction_id TEXT,
+                axiom_id TEXT,
+                position INTEGER,
+                PRIMARY KEY (abstraction_id, axiom_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_axioms_axiom ON abstraction_axioms(axiom_id);
+            CREATE TRIGGER IF NOT EXISTS abstraction_axioms_ad AFTER DELETE ON abstractions BEGIN
+                DELETE FROM abstraction_axioms WHERE abstraction_id = old.id;
+            END;
             
-            CREATE INDEX IF NOT EXISTS idx_link_source ON links(source_id);
-            CREATE INDEX IF NOT EXISTS idx_link_target ON links(target_id);
+            -- Upserts keep the row: drop codes whose content (hash) changed
+            CREATE TRIGGER IF NOT EXISTS embeddings_sq8_au AFTER UPDATE OF embedding_hash ON abstractions
+            WHEN old.embedding_hash IS NOT new.embedding_hash BEGIN
+                DELETE FROM embeddings_sq8 WHERE id = old.id;
+            END;
         """)
         self.conn.commit()
-
-    def add_abstraction(self, abstraction: Abstraction, embedding: List[float]):
-        """Add abstraction to both Chroma (vector) and SQLite (metadata)"""
+        if needs_migration:
+            self._migrate_axioms_column()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO meta (k, v) VALUES ('schema_version', ?) "
+                    "ON CONFLICT(k) DO UPDATE SET v = excluded.v", (str(self.SCHEMA_VERSION),)
+                )
+        if not had_covering:
+            # Fresh stats so the planner picks the new indexes right away
+            self.conn.execute("ANALYZE abstractions;")
+            self.conn.execute("ANALYZE links;")
+            self.conn.commit()
+        self._init_fts()
         
-        # 1. Add to Chroma
-        # Ensure embedding is list (Chroma requirement)
-        if hasattr(embedding, 'tolist'):
-            embedding = embedding.tolist()
-            
-        # Check dimensionality to route to correct collection
-        # Text (MiniLM) = 384, Image (CLIP) = 512
-        if len(embedding) == 512:
-            self.image_collection.upsert(
-                ids=[abstraction.id],
-                embeddings=[embedding],
-                metadatas=[{"cluster_id": str(abstraction.cluster_id) if abstraction.cluster_id else ""}],
-                documents=[abstraction.content]
-            )
-        else:
-            self.collection.upsert(
-                ids=[abstraction.id],
-                embeddings=[embedding],
-                metadatas=[{"cluster_id": str(abstraction.cluster_id) if abstraction.cluster_id else ""}],
-                documents=[abstraction.content] # Optional, but good for debug
-            )
+        # Long-lived connection: analyze tables whose stats are missing/stale
+        self.conn.execute("PRAGMA optimize=0x10002;")
         
-        # 2. Add to SQLite (Abstractions Table)
-        self.conn.execute("""
-            INSERT OR REPLACE INTO abstractions VALUES (
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-            )
-        """, (
+        self._init_readers()
+        self._last_priming_fold = time.monotonic()
+        
+        # Write-back cache for update_metrics: id -> pending metric fields
+        self._dirty_metrics: Dict[str, Dict[str, object]] = {}
+        self._metrics_lock = threading.Lock()
+        self._metrics_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_metrics)
+        
+        # Declared column affinities, for typed columnar reads (fetch_columns)
+        self.column_types = {
+            row[1]: row[2].upper() for row in self.conn.execute("PRAGMA table_info(abstractions)")
+        }
+
+    def _migrate_columns(self):
+        """Add columns missing from older databases (one table_info read, one script)"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(abstractions)")}
+        missing = [
+            f"ALTER TABLE abstractions ADD COLUMN {col} {col_type};"
+            for col, col_type in self._MIGRATED_COLUMNS if col not in columns
+        ]
+        if missing:
+            self.conn.executescript("\n".join(missing))
+            
+        # Backfill previews for rows written before content_snippet existed
+        self.conn.execute(
+            "UPDATE abstractions SET content_snippet = substr(content, 1, ?) WHERE content_snippet IS NULL",
+            (SNIPPET_LENGTH,)
+        )
+        # last_used is naive local time; 'utc' converts it to a true epoch
+        self.conn.execute(
+            "UPDATE abstractions SET last_used_ts = CAST(strftime('%s', last_used, 'utc') AS INTEGER) "
+            "WHERE last_used_ts IS NULL AND last_used IS NOT NULL"
+        )
+        self.conn.commit()
+
+    def _migrate_axioms_column(self):
+        """
+        Move the legacy axioms_used JSON column into abstraction_axioms, then drop it.
+        Before SQLite 3.35 the (now unused) column is left in place.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(abstractions)")}
+        if "axioms_used" not in columns:
+            return
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR IGNORE INTO abstraction_axioms (abstraction_id, axiom_id, position)
+                SELECT a.id, j.value, j.key
+                FROM abstractions AS a, json_each(a.axioms_used) AS j
+                WHERE json_valid(a.axioms_used)
+            """)
+            if HAS_SQLITE_3_35:
+                self.conn.execute("ALTER TABLE abstractions DROP COLUMN axioms_used")
+        logger.info("Migrated axioms_used into abstraction_axioms")
+
+    def _init_readers(self):
+        """
+        self.conn is the single writer (serialized by _write_lock); hot lookups
+        go through a pool of read-only connections so WAL lets them run while
+        a write is in progress. Readers only see committed data, so _read uses
+        the writer while it holds uncommitted (commit=False) writes.
+        """
+        self._write_lock = threading.RLock()
+        self._reader_pool: Optional[queue.Queue] = None
+        if config.METADATA_DB_PATH == ":memory:" or config.SQLITE_READER_POOL_SIZE <= 0:
+            return  # Private in-memory DB can't be shared; read via the writer
+            
+        uri = Path(config.METADATA_DB_PATH).resolve().as_uri() + "?mode=ro"
+        self._reader_pool = queue.Queue()
+        for _ in range(config.SQLITE_READER_POOL_SIZE):
+            reader = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+            reader.row_factory = sqlite3.Row
+            reader.execute("PRAGMA query_only=1;")
+            reader.execute("PRAGMA mmap_size=268435456;")
+            reader.execute("PRAGMA busy_timeout=5000;")
+            self._reader_pool.put(reader)
+
+    @contextmanager
+    def _read(self):
+        """Borrow a read-only connection (the writer if none, or if it has pending writes)"""
+        if self._reader_pool is None or self.conn.in_transaction:
+            yield self.conn
+            return
+        reader = self._reader_pool.get()
+        try:
+            yield reader
+        finally:
+            self._reader_pool.put(reader)
+
+    def _init_fts(self):
+        """Trigram FTS5 index over content so substring search avoids a full scan"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'abstractions_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS abstractions_fts USING fts5(
+                    content, content='abstractions', content_rowid='rowid', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS abstractions_fts_ai AFTER INSERT ON abstractions BEGIN
+                    INSERT INTO abstractions_fts(rowid, content) VALUES (new.rowid, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS abstractions_fts_ad AFTER DELETE ON abstractions BEGIN
+                    INSERT INTO abstractions_fts(abstractions_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS abstractions_fts_au AFTER UPDATE OF content ON abstractions BEGIN
+                    INSERT INTO abstractions_fts(abstractions_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+                    INSERT INTO abstractions_fts(rowid, content) VALUES (new.rowid, new.content);
+                END;
+            """)
+            if not exists:
+                # Index rows written before the FTS table existed
+                self.conn.execute("INSERT INTO abstractions_fts(abstractions_fts) VALUES ('rebuild')")
+                self.conn.commit()
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 trigram index unavailable, falling back to LIKE search: {e}")
+            self.has_fts = False
+
+    def optimize(self):
+        """Refresh query-planner statistics (PRAGMA optimize); cheap when nothing changed"""
+        self.conn.execute("PRAGMA optimize;")
+
+    def flush(self):
+        """Commit writes that were issued with commit=False (batched callers)"""
+        with self._write_lock:
+            self.conn.commit()
+
+    # Explicit column list: positional VALUES breaks whenever a migration adds a column.
+    # UPSERT updates in place (same rowid, no delete+insert, no index churn) on re-save.
+    _SQL_INSERT_ABSTRACTION = """
+        INSERT INTO abstractions (
+            id, version, content, embedding_hash, cluster_id, metadata,
+            quality_score, usage_count, successful_application_count,
+            last_used, created_at, compression_ratio, accuracy_preserved,
+            reuse_contexts, decay_score, image_path, salience,
+            is_axiom_derived, proof_id, consistency_score,
+            integrity_score, content_snippet, last_used_ts
+        ) VALUES (
+            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+        )
+        ON CONFLICT(id) DO UPDATE SET
+            version = excluded.version, content = excluded.content, embedding_hash = excluded.embedding_hash,
+            cluster_id = excluded.cluster_id, metadata = excluded.metadata, quality_score = excluded.quality_score,
+            usage_count = excluded.usage_count, successful_application_count = excluded.successful_application_count, last_used = excluded.last_used,
+            created_at = excluded.created_at, compression_ratio = excluded.compression_ratio, accuracy_preserved = excluded.accuracy_preserved,
+            reuse_contexts = excluded.reuse_contexts, decay_score = excluded.decay_score, image_path = excluded.image_path,
+            salience = excluded.salience, is_axiom_derived = excluded.is_axiom_derived, proof_id = excluded.proof_id,
+            consistency_score = excluded.consistency_score, integrity_score = excluded.integrity_score,
+            content_snippet = excluded.content_snippet, last_used_ts = excluded.last_used_ts
+    """
+    _SQL_INSERT_LINK = """
+        INSERT INTO links VALUES (?, ?, ?, ?)
+        ON CONFLICT(source_id, target_id, type) DO UPDATE SET weight = excluded.weight
+    """
+    # Hot statements as constants: identical text keeps sqlite3's statement cache hitting
+    _SQL_GET_BY_ID = "SELECT * FROM abstractions WHERE id = ?"
+    _SQL_GET_LINKS = "SELECT target_id, type, weight FROM links WHERE source_id = ?"
+    _SQL_GET_AXIOMS = "SELECT axiom_id FROM abstraction_axioms WHERE abstraction_id = ? ORDER BY position"
+    _SQL_SAMPLE_ROW = "SELECT id, content, quality_score, decay_score FROM abstractions WHERE quality_score > ? "
+    # Columns all in idx_abs_covering: light reads never touch content/metadata
+    _SQL_GET_LIGHT = "SELECT id, quality_score, decay_score, cluster_id FROM abstractions"
+    _SQL_GET_BY_HASH = "SELECT * FROM abstractions WHERE embedding_hash = ?"
+    _SQL_GET_BY_HASH_LEGACY = "SELECT * FROM abstractions WHERE embedding_hash IN (?, ?) LIMIT 1"
+    _SQL_UPDATE_METRICS = """
+        UPDATE abstractions SET 
+            usage_count = ?,
+            successful_application_count = ?,
+            quality_score = ?,
+            last_used = ?,
+            last_used_ts = ?,
+            decay_score = ?,
+            salience = ?,
+            integrity_score = ?
+        WHERE id = ?
+    """
+    _SQL_BOOST_CLUSTER = """
+        INSERT INTO priming_deltas (cluster_id, delta) VALUES (?, 1)
+        ON CONFLICT(cluster_id) DO UPDATE SET delta = delta + 1
+    """
+    _SQL_FOLD_PRIMING = """
+        UPDATE abstractions
+        SET successful_application_count = successful_application_count + p.delta
+        FROM priming_deltas AS p
+        WHERE abstractions.cluster_id = p.cluster_id
+    """
+
+    @staticmethod
+    def _abstraction_params(abstraction: Abstraction) -> tuple:
+        """Parameters for _SQL_INSERT_ABSTRACTION"""
+        return (
             abstraction.id,
             abstraction.version,
             abstraction.content,
             abstraction.embedding_hash,
             abstraction.cluster_id,
-            json.dumps(abstraction.metadata),
+            _json_dumps(abstraction.metadata),
             abstraction.quality_score,
             abstraction.usage_count,
             abstraction.successful_application_count,
@@ -181,148 +474,503 @@ class EngramStorage:
             int(abstraction.is_axiom_derived),
             abstraction.proof_id,
             abstraction.consistency_score,
-            json.dumps(abstraction.axioms_used),
-        ))
-        
-        # 3. Add Links (Graph RAG)
-        if abstraction.links:
-            for link in abstraction.links:
-                self.conn.execute("""
-                    INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?)
-                """, (abstraction.id, link.target_id, link.type, link.weight))
-                
-        self.conn.commit()
+            abstraction.integrity_score,
+            abstraction.content[:SNIPPET_LENGTH],
+            int(abstraction.last_used.timestamp()),
+        )
+
+    def add_abstraction(self, abstraction: Abstraction, embedding: List[float], commit: bool = True):
+        """Add abstraction to both Chroma (vector) and SQLite (metadata).
+        commit=False leaves the SQLite write pending until flush()."""
+        self.add_abstractions_bulk([(abstraction, embedding)], commit=commit)
+
+    def add_abstractions_bulk(self, items: List[Tuple[Abstraction, List[float]]], commit: bool = True):
+        """
+        Add many abstractions with one Chroma upsert per collection and one
+        SQLite transaction (single fsync) for all rows and links.
+        """
+        if not items:
+            return
+            
+        # 1. Add to Chroma
+        # Check dimensionality to route to correct collection
+        # Text (MiniLM) = 384, Image (CLIP) = 512
+        batches = {"text": ([], [], [], []), "image": ([], [], [], [])}
+        for abstraction, embedding in items:
+            # Ensure embedding is list (Chroma requirement)
+            if hasattr(embedding, 'tolist'):
+                embedding = embedding.tolist()
+            ids, embeddings, metadatas, documents = batches["image" if len(embedding) == 512 else "text"]
+            ids.append(abstraction.id)
+            embeddings.append(embedding)
+            metadatas.append({"cluster_id": str(abstraction.cluster_id) if abstraction.cluster_id else ""})
+            documents.append(abstraction.content) # Optional, but good for debug
+        collections = {"text": self.collection, "image": self.image_collection}
+        for kind, (ids, embeddings, metadatas, documents) in batches.items():
+            if ids:
+                collections[kind].upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
         
-    def get_abstraction(self, abstraction_id: str) -> Optional[Abstraction]:
-        cursor = self.conn.execute("SELECT * FROM abstractions WHERE id = ?", (abstraction_id,))
-        row = cursor.fetchone()
+        # 2. Add to SQLite (Abstractions + Links for Graph RAG)
+        # A full row write supersedes any pending metrics for the same ids
+        if self._dirty_metrics:
+            with self._metrics_lock:
+                for abstraction, _ in items:
+                    self._dirty_metrics.pop(abstraction.id, None)
+        params = [self._abstraction_params(abstraction) for abstraction, _ in items]
+        link_rows = [
+            (abstraction.id, link.target_id, link.type, link.weight)
+            for abstraction, _ in items for link in abstraction.links
+        ]
+        axiom_rows = [
+            (abstraction.id, axiom_id, position)
+            for abstraction, _ in items for position, axiom_id in enumerate(abstraction.axioms_used)
+        ]
+        with self._write_lock:
+            self.conn.executemany(self._SQL_INSERT_ABSTRACTION, params)
+            if link_rows:
+                self.conn.executemany(self._SQL_INSERT_LINK, link_rows)
+            # Re-saves replace the axiom set; ids without axioms are just PK probes
+            self.conn.executemany(
+                "DELETE FROM abstraction_axioms WHERE abstraction_id = ?",
+                [(abstraction.id,) for abstraction, _ in items]
+            )
+            if axiom_rows:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO abstraction_axioms (abstraction_id, axiom_id, position) VALUES (?, ?, ?)",
+                    axiom_rows
+                )
+            # After the row upsert: a changed hash fires the trigger that clears codes
+            if config.USE_INT8_VECTORS:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings_sq8 (id, codes) VALUES (?, ?)",
+                    [(abstraction.id, quantize_embeddings(embedding, "int8").tobytes())
+                     for abstraction, embedding in items]
+                )
+            if commit:
+                self.conn.commit()
         
-        if not row:
-            return None
-            
-        data = dict(row)
+    def get_embeddings_sq8(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        """Dequantized (float32) embeddings from the int8 store; ids without codes are omitted"""
+        found = {}
+        with self._read() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for abs_id, codes in conn.execute(
+                    f"SELECT id, codes FROM embeddings_sq8 WHERE id IN ({placeholders})", chunk
+                ):
+                    found[abs_id] = dequantize_embeddings(np.frombuffer(codes, dtype=np.int8))
+        return found
+
+    def _row_to_abstraction(self, row: sqlite3.Row, links: List[Dict], axioms: List[str]) -> Abstraction:
+        """
+        Decode one abstractions row (JSON, datetimes, migration NULLs) into the model.
+        Rows are our own writes, so model_construct skips pydantic re-validation.
+        """
+        # NULLs (columns added by migrations) fall back to the model defaults
+        data = {key: value for key, value in zip(row.keys(), row) if value is not None}
         
         # Parse JSON and datetime fields
-        data['metadata'] = json.loads(data['metadata'])
+        data['metadata'] = _json_loads(data['metadata']) if 'metadata' in data else {}
         data['last_used'] = datetime.fromisoformat(data['last_used']) 
         data['created_at'] = datetime.fromisoformat(data['created_at'])
+        data['links'] = [Link.model_construct(**link) for link in links]
         
-        # Fetch Links
-        link_cursor = self.conn.execute("SELECT target_id, type, weight FROM links WHERE source_id = ?", (abstraction_id,))
-        links_data = link_cursor.fetchall()
-        
-        # Reconstruct Link objects
-        # We need to import Link inside function to avoid circular import if defined in abstraction.py
-        # But we can just use the dict structure or assume Abstraction validates it
-        links_list = []
-        for l_row in links_data:
-            links_list.append({
-                "target_id": l_row[0],
-                "type": l_row[1],
-                "weight": l_row[2]
-            })
-        data['links'] = links_list
+        # SQLite stores the axiom flag as 0/1
+        data['is_axiom_derived'] = bool(data.get('is_axiom_derived', False))
         
-        # Handle potential None from schema migration
-        if data.get('salience') is None:
-            data['salience'] = 1.0
-        
-        # Handle new axiom fields (migration safety)
-        if data.get('is_axiom_derived') is not None:
-            data['is_axiom_derived'] = bool(data['is_axiom_derived'])
-        else:
-            data['is_axiom_derived'] = False
-        
-        if data.get('consistency_score') is None:
-            data['consistency_score'] = 1.0
-        
-        if data.get('axioms_used'):
-            try:
-                data['axioms_used'] = json.loads(data['axioms_used'])
-            except (json.JSONDecodeError, TypeError):
-                data['axioms_used'] = []
-        else:
-            data['axioms_used'] = []
+        data['axioms_used'] = axioms
+        data.pop('last_used_ts', None)
+        # Metrics written by update_metrics but not flushed yet
+        pending = self._dirty_metrics.get(data['id'])
+        if pending:
+            data.update((key, value) for key, value in pending.items() if value is not None)
+        # Not persisted; filled here because model_construct's default_factory
+        # path introspects the factory signature on every call
+        data['source_chunks'] = []
+        data['child_abstractions'] = []
+        data['verification_history'] = []
+            
+        return Abstraction.model_construct(**data)
+
+    def get_abstraction(self, abstraction_id: str) -> Optional[Abstraction]:
+        with self._read() as conn:
+            row = conn.execute(self._SQL_GET_BY_ID, (abstraction_id,)).fetchone()
             
-        return Abstraction(**data)
+            if not row:
+                return None
+                
+            # Fetch Links
+            link_rows = conn.execute(self._SQL_GET_LINKS, (abstraction_id,)).fetchall()
+            axioms = [axiom_id for (axiom_id,) in conn.execute(self._SQL_GET_AXIOMS, (abstraction_id,))]
+        links_list = [
+            {"target_id": target_id, "type": type_, "weight": weight}
+            for target_id, type_, weight in link_rows
+        ]
+        return self._row_to_abstraction(row, links_list, axioms)
+
+    def _to_light(self, row) -> AbstractionLight:
+        abs_id, quality, decay, cluster_id = row
+        pending = self._dirty_metrics.get(abs_id)
+        if pending:
+            quality, decay = pending['quality_score'], pending['decay_score']
+        return AbstractionLight(abs_id, quality or 0.0, decay or 0.0, cluster_id)
+
+    def get_abstraction_light(self, abstraction_id: str) -> Optional[AbstractionLight]:
+        """id/quality/decay/cluster only: no links, axioms, JSON or datetime decoding"""
+        with self._read() as conn:
+            row = conn.execute(f"{self._SQL_GET_LIGHT} WHERE id = ?", (abstraction_id,)).fetchone()
+        return self._to_light(row) if row else None
+
+    def get_abstractions_light(self, ids: List[str]) -> List[AbstractionLight]:
+        """Bulk get_abstraction_light, in the order of ids; missing ids are skipped"""
+        found = {}
+        with self._read() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(f"{self._SQL_GET_LIGHT} WHERE id IN ({placeholders})", chunk):
+                    found[row[0]] = self._to_light(row)
+        return [found[abs_id] for abs_id in dict.fromkeys(ids) if abs_id in found]
+
+    def top_abstractions_light(self, limit: int = 10) -> List[AbstractionLight]:
+        """Highest-quality abstractions as light tuples (backward scan of idx_abs_covering)"""
+        self.flush_metrics()  # Rank on current scores
+        with self._read() as conn:
+            rows = conn.execute(f"{self._SQL_GET_LIGHT} ORDER BY quality_score DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_light(row) for row in rows]
+
+    def get_abstractions_bulk(self, ids: List[str]) -> List[Abstraction]:
+        """
+        Hydrate many abstractions with three queries per 500 ids (rows, links,
+        axioms) instead of three per id. Returned in the order of ids; missing ids are skipped.
+        """
+        rows = {}
+        links: Dict[str, List[Dict]] = {}
+        axioms: Dict[str, List[str]] = {}
+        with self._read() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(f"SELECT * FROM abstractions WHERE id IN ({placeholders})", chunk):
+                    rows[row['id']] = row
+                for source_id, target_id, type_, weight in conn.execute(
+                    f"SELECT source_id, target_id, type, weight FROM links WHERE source_id IN ({placeholders})", chunk
+                ):
+                    links.setdefault(source_id, []).append({"target_id": target_id, "type": type_, "weight": weight})
+                for abs_id, axiom_id in conn.execute(
+                    f"SELECT abstraction_id, axiom_id FROM abstraction_axioms "
+                    f"WHERE abstraction_id IN ({placeholders}) ORDER BY abstraction_id, position", chunk
+                ):
+                    axioms.setdefault(abs_id, []).append(axiom_id)
+                
+        return [
+            self._row_to_abstraction(rows[abs_id], links.get(abs_id, []), axioms.get(abs_id, []))
+            for abs_id in dict.fromkeys(ids) if abs_id in rows
+        ]
  
     def update_metrics(self, abstraction: Abstraction):
-        """Update just the metrics for an abstraction (fast path)"""
-        self.conn.execute("""
-            UPDATE abstractions SET 
-                usage_count = ?,
-                successful_application_count = ?,
-                quality_score = ?,
-                last_used = ?,
-                decay_score = ?,
-                salience = ?,
-                integrity_score = ?
-            WHERE id = ?
-        """, (
-            abstraction.usage_count,
-            abstraction.successful_application_count,
-            abstraction.quality_score,
-            abstraction.last_used.isoformat(),
-            abstraction.decay_score,
-            abstraction.salience,
-            abstraction.integrity_score,
-            abstraction.id
-        ))
-        self.conn.commit()
+        """
+        Update just the metrics for an abstraction (fast path).
+        Write-back: the values are buffered and flushed with one executemany and
+        one commit per METRICS_FLUSH_INTERVAL, so retrieval doesn't pay a commit
+        per hit. Model reads (get_abstraction*) see pending values immediately.
+        """
+        pending = {
+            'usage_count': abstraction.usage_count,
+            'successful_application_count': abstraction.successful_application_count,
+            'quality_score': abstraction.quality_score,
+            'last_used': abstraction.last_used,
+            'decay_score': abstraction.decay_score,
+            'salience': abstraction.salience,
+            'integrity_score': abstraction.integrity_score,
+        }
+        with self._metrics_lock:
+            self._dirty_metrics[abstraction.id] = pending
+            flush_now = len(self._dirty_metrics) >= config.METRICS_FLUSH_BATCH
+            if not flush_now and self._metrics_timer is None:
+                self._metrics_timer = threading.Timer(config.METRICS_FLUSH_INTERVAL, self.flush_metrics)
+                self._metrics_timer.daemon = True
+                self._metrics_timer.start()
+        if flush_now:
+            self.flush_metrics()
+
+    def flush_metrics(self) -> int:
+        """
+        Write all buffered update_metrics values in one transaction; returns rows flushed.
+        The buffer is taken under _write_lock, so a flush can't land after a later
+        write (e.g. a priming fold) and overwrite it with older absolute values.
+        """
+        with self._write_lock:
+            with self._metrics_lock:
+                dirty, self._dirty_metrics = self._dirty_metrics, {}
+                if self._metrics_timer is not None:
+                    self._metrics_timer.cancel()
+                    self._metrics_timer = None
+            if not dirty:
+                return 0
+                
+            rows = []
+            for abs_id, m in dirty.items():
+                last_used = m['last_used']
+                rows.append((
+                    m['usage_count'],
+                    m['successful_application_count'],
+                    m['quality_score'],
+                    last_used.isoformat(),
+                    int(last_used.timestamp()),
+                    m['decay_score'],
+                    m['salience'],
+                    m['integrity_score'],
+                    abs_id
+                ))
+            self.conn.executemany(self._SQL_UPDATE_METRICS, rows)
+            self.conn.commit()
+        return len(rows)
     
-    def get_abstraction_by_hash(self, embedding_hash: str) -> Optional[Abstraction]:
-        """Fast lookup by hash for duplicate checking"""
-        cursor = self.conn.execute("SELECT * FROM abstractions WHERE embedding_hash = ?", (embedding_hash,))
-        row = cursor.fetchone()
-        
-        if not row:
-            return None
+    def load_decay_soa(self) -> Dict[str, object]:
+        """
+        Decay inputs for every abstraction as parallel arrays (one SELECT, no hydration).
+        last_used is epoch seconds (the last_used_ts column, no date parsing).
+        """
+        self.flush_metrics()
+        rows = self.conn.execute("""
+            SELECT id,
+                   last_used_ts,
+                   COALESCE(reuse_contexts, 0),
+                   COALESCE(accuracy_preserved, 1.0),
+                   COALESCE(usage_count, 0),
+                   cluster_id
+            FROM abstractions
+        """).fetchall()
+        ids, last_used, reuse, accuracy, usage, cluster_ids = (list(col) for col in zip(*rows)) if rows else ([], [], [], [], [], [])
+        return {
+            "ids": ids,
+            "last_used": np.array(last_used, dtype=np.int64),
+            "reuse_contexts": np.array(reuse, dtype=np.int64),
+            "accuracy_preserved": np.array(accuracy, dtype=np.float64),
+            "usage_count": np.array(usage, dtype=np.int64),
+            "cluster_ids": cluster_ids,
+        }
+
+    def apply_decay(self, updates: List[Tuple[float, str]], prune_ids: List[str]):
+        """
+        Persist a decay cycle: (decay_score, abstraction_id) updates and pruned ids
+        in one SQLite transaction, then chunked Chroma deletes in parallel.
+        """
+        with self._write_lock, self.conn:
+            self.conn.executemany("UPDATE abstractions SET decay_score = ? WHERE id = ?", updates)
+            self.conn.executemany("DELETE FROM abstractions WHERE id = ?", [(abs_id,) for abs_id in prune_ids])
             
-        data = dict(row)
-        data['metadata'] = json.loads(data['metadata'])
-        data['last_used'] = datetime.fromisoformat(data['last_used']) 
-        data['created_at'] = datetime.fromisoformat(data['created_at'])
-        
-        return Abstraction(**data)
+        self._delete_vectors(prune_ids)
+
+    def sample_by_quality(self, min_quality: float, k: int) -> List[Tuple[str, str, float, float]]:
+        """
+        Up to k distinct random (id, content, quality_score, decay_score) rows with quality_score > min_quality.
+        Small qualifying sets (counted with a scan bounded at SAMPLE_EXACT_MAX) are
+        sampled uniformly by distinct random OFFSETs. Large ones probe random rowids
+        (O(log N) each) and take the next qualifying row; that favours rows after
+        rowid gaps, so probes that come back short fall back to OFFSET sampling.
+        """
+        with self._read() as conn:
+            n = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM abstractions WHERE quality_score > ? LIMIT ?)",
+                (min_quality, config.SAMPLE_EXACT_MAX + 1)
+            ).fetchone()[0]
+            if n <= config.SAMPLE_EXACT_MAX:
+                return self._sample_by_offset(conn, min_quality, k, n)
+                
+            max_rowid = conn.execute("SELECT max(rowid) FROM abstractions").fetchone()[0]
+            found: Dict[str, Tuple[str, str, float, float]] = {}
+            for _ in range(k * 4):  # Retries absorb duplicate hits
+                if len(found) >= k:
+                    break
+                row = conn.execute(
+                    self._SQL_SAMPLE_ROW + "AND rowid >= ? ORDER BY rowid LIMIT 1",
+                    (min_quality, random.randint(1, max_rowid))
+                ).fetchone() or conn.execute(
+                    self._SQL_SAMPLE_ROW + "ORDER BY rowid LIMIT 1", (min_quality,)
+                ).fetchone()
+                if row is None:
+                    break  # Rows changed under us; nothing qualifies now
+                found.setdefault(row[0], tuple(row))
+            if len(found) >= k:
+                return list(found.values())
+                
+            n = conn.execute(
+                "SELECT COUNT(*) FROM abstractions WHERE quality_score > ?", (min_quality,)
+            ).fetchone()[0]
+            return self._sample_by_offset(conn, min_quality, k, n)
+
+    def _sample_by_offset(self, conn: sqlite3.Connection, min_quality: float, k: int, n: int) -> List[Tuple[str, str, float, float]]:
+        """k distinct random offsets into the n qualifying rows (idx_abs_covering order)"""
+        found: Dict[str, Tuple[str, str, float, float]] = {}
+        for offset in random.sample(range(n), min(k, n)):
+            row = conn.execute(
+                self._SQL_SAMPLE_ROW + "ORDER BY quality_score LIMIT 1 OFFSET ?", (min_quality, offset)
+            ).fetchone()
+            if row:
+                found.setdefault(row[0], tuple(row))
+        return list(found.values())
+
+    def fetch_columns(self, ids: Optional[List[str]], cols: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Read plain abstraction columns as NumPy arrays (SoA) without hydrating models.
+        REAL -> float64 (NULL = nan), INTEGER -> int64 (float64 if NULLs), else object.
+        ids=None reads every row; otherwise chunked IN queries. Rows come in SQL order.
+        """
+        unknown = [col for col in cols if col not in self.column_types]
+        if unknown:
+            raise ValueError(f"Unknown abstraction columns: {unknown}")
+            
+        select = f"SELECT {', '.join(cols)} FROM abstractions"
+        if ids is None:
+            rows = self.conn.execute(select).fetchall()
+        else:
+            rows = []
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self.conn.execute(f"{select} WHERE id IN ({placeholders})", chunk).fetchall())
+                
+        columns = list(zip(*rows)) if rows else [()] * len(cols)
+        result = {}
+        for col, values in zip(cols, columns):
+            col_type = self.column_types[col]
+            has_null = None in values
+            if col_type == "REAL" or (col_type == "INTEGER" and has_null):
+                result[col] = np.array(values, dtype=np.float64)
+            elif col_type == "INTEGER":
+                result[col] = np.fromiter(values, dtype=np.int64, count=len(values))
+            else:
+                result[col] = np.array(values, dtype=object)
+        return result
+
+    def update_cluster_ids(self, updates: List[Tuple[str, str]]):
+        """
+        Batch-relabel clusters from (abstraction_id, cluster_id) pairs.
+        One SQLite transaction + chunked Chroma metadata updates; embeddings are
+        unchanged so nothing is re-sent to the vector index.
+        """
+        if not updates:
+            return
+            
+        with self._write_lock, self.conn:
+            self.conn.executemany(
+                "UPDATE abstractions SET cluster_id = ? WHERE id = ?",
+                [(cluster_id, abs_id) for abs_id, cluster_id in updates]
+            )
+            
+        for start in range(0, len(updates), 500):
+            chunk = updates[start:start + 500]
+            self.collection.update(
+                ids=[abs_id for abs_id, _ in chunk],
+                metadatas=[{"cluster_id": cluster_id} for _, cluster_id in chunk]
+            )
+    
+    def get_abstraction_by_hash(self, embedding_hash: str, legacy_hash: Optional[str] = None) -> Optional[Abstraction]:
+        """
+        Fast lookup by hash for duplicate checking.
+        legacy_hash lets callers also match rows keyed before the xxh3 switch (MD5).
+        Always asks SQLite (idx_hash): rows may come from other processes/connections.
+        """
+        with self._read() as conn:
+            if legacy_hash:
+                row = conn.execute(self._SQL_GET_BY_HASH_LEGACY, (embedding_hash, legacy_hash)).fetchone()
+            else:
+                row = conn.execute(self._SQL_GET_BY_HASH, (embedding_hash,)).fetchone()
+            if not row:
+                return None
+            axioms = [axiom_id for (axiom_id,) in conn.execute(self._SQL_GET_AXIOMS, (row['id'],))]
+            
+        return self._row_to_abstraction(row, [], axioms)
+
+    def has_hash(self, embedding_hash: str, legacy_hash: Optional[str] = None) -> bool:
+        """Exists check for dedup keys (id-only idx_hash lookup, no row decoding)"""
+        with self._read() as conn:
+            if legacy_hash:
+                row = conn.execute(
+                    "SELECT id FROM abstractions WHERE embedding_hash IN (?, ?) LIMIT 1", (embedding_hash, legacy_hash)
+                ).fetchone()
+            else:
+                row = conn.execute("SELECT id FROM abstractions WHERE embedding_hash = ? LIMIT 1", (embedding_hash,)).fetchone()
+        return row is not None
 
     def delete_abstraction(self, abstraction_id: str):
         """Delete an abstraction and its links"""
         # 1. Delete from SQLite
-        self.conn.execute("DELETE FROM abstractions WHERE id = ?", (abstraction_id,))
-        self.conn.execute("DELETE FROM links WHERE source_id = ? OR target_id = ?", (abstraction_id, abstraction_id))
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute("DELETE FROM abstractions WHERE id = ?", (abstraction_id,))
+            self.conn.execute("DELETE FROM links WHERE source_id = ? OR target_id = ?", (abstraction_id, abstraction_id))
+            self.conn.commit()
         
-        # 2. Delete from ChromaDB
+        # 2. Delete from ChromaDB in the background (SQLite is the source of truth)
+        self._delete_vectors([abstraction_id], wait_for=False)
+
+    def _delete_vectors(self, ids: List[str], wait_for: bool = True) -> List[Future]:
+        """
+        Delete ids from the text collection in chunks of 256 on the delete pool.
+        wait_for=True blocks until all chunks finish; failures are only logged
+        (a vector may be missing after a sync issue).
+        """
+        futures = [
+            self._vector_deletes.submit(self._delete_vector_chunk, ids[start:start + 256])
+            for start in range(0, len(ids), 256)
+        ]
+        if wait_for and futures:
+            wait(futures)
+        return futures
+
+    def _delete_vector_chunk(self, ids: List[str]):
         try:
-            from chromadb.api.models.Collection import Collection
-            # self.collection might be cached?
-            self.collection.delete(ids=[abstraction_id])
+            self.collection.delete(ids=ids)
         except Exception as e:
-            # Might not exist if sync issue
-            pass
+            logger.warning(f"Chroma delete of {len(ids)} vector(s) failed: {e}")
             
     def prune_orphans(self, min_quality: float = 0.3) -> int:
         """Remove abstractions with no links and low quality"""
-        # Find orphans: Nodes not in source_id AND not in target_id
-        # We need to be careful with NOT IN if list is huge.
-        # Efficient approach: LEFT JOIN links
-        
-        # Simpler: SELECT id FROM abstractions WHERE quality_score < ?
-        # Then filter in Python or use NOT EXISTS
-        
-        cursor = self.conn.execute("""
+        self.flush_metrics()  # Prune on current quality scores
+        # Orphans have no links by definition, so no link cleanup is needed:
+        # one DELETE ... RETURNING (SELECT + DELETE before SQLite 3.35), one
+        # commit, then the Chroma batch delete.
+        # NOT EXISTS probes idx_links_source_weight / idx_links_target.
+        orphan_sql = """
             SELECT id FROM abstractions 
             WHERE quality_score < ?
             AND NOT EXISTS (SELECT 1 FROM links WHERE source_id = abstractions.id)
             AND NOT EXISTS (SELECT 1 FROM links WHERE target_id = abstractions.id)
             LIMIT 100
-        """, (min_quality,))
-        
-        orphans = [row[0] for row in cursor.fetchall()]
-        
-        count = 0
-        for oid in orphans:
-            self.delete_abstraction(oid)
-            count += 1
+        """
+        with self._write_lock, self.conn:
+            if HAS_SQLITE_3_35:
+                orphans = [row[0] for row in self.conn.execute(
+                    f"DELETE FROM abstractions WHERE id IN ({orphan_sql}) RETURNING id", (min_quality,)
+                ).fetchall()]
+            else:
+                orphans = [row[0] for row in self.conn.execute(orphan_sql, (min_quality,)).fetchall()]
+                self.conn.executemany("DELETE FROM abstractions WHERE id = ?", [(abs_id,) for abs_id in orphans])
             
-        return count
+        self._delete_vectors(orphans)
+        return len(orphans)
+
+    def boost_cluster(self, cluster_id: str):
+        """
+        Implicit priming: +1 successful application for every member of a cluster.
+        Only bumps a per-cluster counter; fold_priming_deltas applies it to the rows.
+        """
+        with self._write_lock:
+            self.conn.execute(self._SQL_BOOST_CLUSTER, (cluster_id,))
+            self.conn.commit()
+        if time.monotonic() - self._last_priming_fold >= config.PRIMING_FOLD_INTERVAL:
+            self.fold_priming_deltas()
+
+    def fold_priming_deltas(self) -> int:
+        """Apply pending priming counts to abstractions in one UPDATE and clear them"""
+        with self._write_lock:
+            # Buffered counts are absolute; land them first so they can't undo the fold
+            self.flush_metrics()
+            self._last_priming_fold = time.monotonic()
+            cursor = self.conn.execute(self._SQL_FOLD_PRIMING)
+            self.conn.execute("DELETE FROM priming_deltas")
+            self.conn.commit()
+        return cursor.rowcount
@@ -1,11 +1,13 @@
 
 import logging
 import random
+from types import SimpleNamespace
+from functools import lru_cache
 from typing import List
 from core.storage import EngramStorage
-from core.graph_manager import GraphManager
+from core.graph_manager import get_graph_manager
 from core.abstraction import Abstraction
-from core.evolution import EvolutionManager
+from core.evolution import get_evolution_manager
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +17,8 @@ class Subconscious:
     """
     def __init__(self):
         self.storage = EngramStorage()
-        self.gm = GraphManager()
-        self.evolution = EvolutionManager()
+        self.gm = get_graph_manager()
+        self.evolution = get_evolution_manager()
         
     def dream(self):
         """
@@ -33,19 +35,14 @@ class Subconscious:
         
         # Import LLM client
         try:
-            from integration.ollama_client import OllamaClient
-            llm = OllamaClient()
+            from integration.ollama_client import get_ollama_client
+            llm = get_ollama_client()
         except:
             logger.warning("Ollama not available. Using simple dream mode.")
             llm = None
         
         # Get high salience nodes
-        cursor = self.storage.conn.execute("""
-            SELECT id, content FROM abstractions 
-            WHERE quality_score > 0.6 
-            ORDER BY RANDOM() LIMIT 5
-        """)
-        candidates = cursor.fetchall()
+        candidates = self.storage.sample_by_quality(0.6, 5)
         
         if len(candidates) < 2:
             return
@@ -62,15 +59,16 @@ class Subconscious:
                 
                 # Enforce truth even in subconscious creation
                 from core.truth_guard import TruthGuard
-                abs1 = self.storage.get_abstraction(a[0])
-                abs2 = self.storage.get_abstraction(b[0])
+                # Sampled rows already carry the scores TruthGuard reads; no re-fetch
+                abs1 = SimpleNamespace(quality_score=a[2], decay_score=a[3] or 0.0)
+                abs2 = SimpleNamespace(quality_score=b[2], decay_score=b[3] or 0.0)
                 risk, is_safe = TruthGuard.calculate_risk([abs1, abs2])
                 if not is_safe:
                     insight = f"[DREAM INSIGHT — LOW CONFIDENCE] {insight}"
                 
                 # Create meta-abstraction from insight
-                from core.abstraction_manager import AbstractionManager
-                am = AbstractionManager()
+                from core.abstraction_manager import get_abstraction_manager
+                am = get_abstraction_manager()
                 meta_abs, created = am.create_abstraction(
                     content=f"DREAM INSIGHT: {insight}",
                     metadata={"source": "dream", "type": "creative_connection"}
@@ -78,8 +76,10 @@ class Subconscious:
                 
                 if created:
                     # Link A → Meta ← B
-                    self.gm.add_link(a[0], meta_abs.id, type="implies_dream", weight=0.6)
-                    self.gm.add_link(b[0], meta_abs.id, type="implies_dream", weight=0.6)
+                    self.gm.add_links([
+                        (a[0], meta_abs.id, "implies_dream", 0.6),
+                        (b[0], meta_abs.id, "implies_dream", 0.6),
+                    ])
                     logger.info(f"💡 Created meta-abstraction: {meta_abs.id[:8]}")
             else:
                 # Fallback: simple link
@@ -106,9 +106,10 @@ class Subconscious:
         # This increases their retention chance
         logger.info(f"🌊 Implicit Priming: Boosting Cluster {active_cluster_id}")
         
-        self.storage.conn.execute("""
-            UPDATE abstractions 
-            SET successful_application_count = successful_application_count + 1 
-            WHERE cluster_id = ?
-        """, (active_cluster_id,))
-        self.storage.conn.commit()
+        self.storage.boost_cluster(active_cluster_id)
+
+
+@lru_cache(maxsize=1)
+def get_subconscious() -> Subconscious:
+    """Process-wide shared Subconscious"""
+    return Subconscious()
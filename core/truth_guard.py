@@ -3,9 +3,12 @@
 # Prevents any layer from producing confident falsehoods.
 # Purely epistemic — never moral, never refuses topics.
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
 from core.abstraction import Abstraction
 
+DEFAULT_SIM = 0.65  # Conservative similarity when no cached score is attached
+
 class TruthGuard:
     """Central truth gate for all layers. Must stay North (maximum honesty)."""
 
@@ -15,20 +18,44 @@ class TruthGuard:
         if not retrieved:
             return 1.0, False
 
-        avg_quality = sum(a.quality_score for a in retrieved) / len(retrieved)
-        avg_decay = sum(a.decay_score for a in retrieved) / len(retrieved)
+        n = len(retrieved)
+        q = np.fromiter((a.quality_score for a in retrieved), dtype=np.float64, count=n)
+        d = np.fromiter((a.decay_score for a in retrieved), dtype=np.float64, count=n)
         # Use cached similarity if available, else conservative default
-        avg_sim = sum(getattr(a, '_embedding_cache_sim', 0.65) for a in retrieved) / len(retrieved)
+        s = np.fromiter((getattr(a, '_embedding_cache_sim', DEFAULT_SIM) for a in retrieved),
+                        dtype=np.float64, count=n)
+        return TruthGuard.calculate_risk_arrays(q, d, s)
+
+    @staticmethod
+    def calculate_risk_arrays(quality: np.ndarray, decay: np.ndarray,
+                              sim: Optional[np.ndarray] = None) -> Tuple[float, bool]:
+        """calculate_risk over column arrays, for callers that already hold them"""
+        if len(quality) == 0:
+            return 1.0, False
+        avg_sim = DEFAULT_SIM if sim is None else float(np.mean(sim))
 
         risk = (
-            0.45 * (1 - avg_sim) +      # weak retrieval
-            0.35 * (1 - avg_quality) +  # low quality memory
-            0.20 * avg_decay            # stale memory
+            0.45 * (1 - avg_sim) +               # weak retrieval
+            0.35 * (1 - float(np.mean(quality))) +  # low quality memory
+            0.20 * float(np.mean(decay))         # stale memory
         )
 
         is_safe = risk < 0.45
         return min(risk, 1.0), is_safe
 
+    @staticmethod
+    def calculate_risk_batch(items: List[Abstraction]) -> List[Tuple[float, bool]]:
+        """Per-item calculate_risk([a]) for many abstractions in one pass"""
+        if not items:
+            return []
+        n = len(items)
+        q = np.fromiter((a.quality_score for a in items), dtype=np.float64, count=n)
+        d = np.fromiter((a.decay_score for a in items), dtype=np.float64, count=n)
+        s = np.fromiter((getattr(a, '_embedding_cache_sim', DEFAULT_SIM) for a in items),
+                        dtype=np.float64, count=n)
+        risk = 0.45 * (1 - s) + 0.35 * (1 - q) + 0.20 * d
+        return [(min(r, 1.0), r < 0.45) for r in risk.tolist()]
+
     @staticmethod
     def enforce_honest_response(query: str, risk: float, retrieved: List[Abstraction]) -> str | None:
         """If unsafe, return forced honest message. Else return None (continue normally)."""
@@ -1,8 +1,22 @@
 import jax
 import jax.numpy as jnp
 from jax import jit
+from functools import partial
+from typing import NamedTuple
+import numpy as np
 import time
-import msvcrt
+
+try:
+    import msvcrt  # Windows console keys (v/d/q); elsewhere the loop just runs
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # ====================== REAL ABSTRACTION TEST DATA ======================
 # These are real, high-quality abstractions (copy-paste from your own system)
@@ -32,6 +46,39 @@ F_BASE = 1.0
 K_SURPRISE = 2.0
 ALPHA_HUNGER = 0.5
 GAMMA_RESONANCE = 0.45
+PIPELINE_STEPS = 16   # Steps per dispatch; the host syncs once per chunk, not per step
+USE_NUMBA = False   # CPU: run steps as an in-place Numba kernel, no XLA dispatch (needs numba)
+RESONANCE_INT8 = False   # int8 x int8 -> int32 resonance GEMV when rows are built (once, not per step; ~5e-3 abs error)
+
+class EngramState(NamedTuple):
+    """
+    Attractor state: a fixed-order pytree (scan carry), updated with _replace.
+    Core abstractions are the first N_CORE rows, addressed with static slices.
+    Every leaf has an explicit (strong) dtype: the AOT executables only accept
+    exactly the input types they were compiled for, and scan outputs are strong.
+    """
+    embeddings: jax.Array
+    quality: jax.Array
+    resonance: jax.Array
+    thinking_power: jax.Array
+    central_reserve: jax.Array
+    vis_active: jax.Array
+    step_count: jax.Array
+    core_centroid: jax.Array
+    aware: jax.Array
+
+def compute_resonance(embeddings, core_centroid):
+    """Alignment of every row with the Persistent Core, mapped to [0, 1] (one GEMV)"""
+    if RESONANCE_INT8:
+        # Unit vectors: components lie in [-1, 1], so one symmetric scale of 127 fits
+        emb_i8 = jnp.round(embeddings * 127.0).astype(jnp.int8)
+        centroid_i8 = jnp.round(core_centroid * 127.0).astype(jnp.int8)
+        dots = jax.lax.dot_general(
+            emb_i8, centroid_i8, (((1,), (0,)), ((), ())), preferred_element_type=jnp.int32
+        ).astype(jnp.float32) / (127.0 * 127.0)  # Strong float32, like the einsum path
+    else:
+        dots = jnp.einsum('nd,d->n', embeddings, core_centroid)
+    return (dots + 1.0) / 2.0
 
 def make_initial_state(key):
     k1, k2, k3 = jax.random.split(key, 3)
@@ -43,63 +90,149 @@ def make_initial_state(key):
     embeddings = embeddings.at[:N_CORE].add(4.0 * common_dir)
     embeddings = embeddings / (jnp.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8)
     
-    state = {
-        'embeddings': embeddings,
-        'quality': jnp.full(N_ABS, 0.25),
-        'resonance': jnp.zeros(N_ABS),
-        'thinking_power': jnp.full(N_ABS, 0.01),
-        'central_reserve': jnp.array(20.0),
-        'vis_active': jnp.array(False),
-        'step_count': jnp.array(0, dtype=jnp.int32),
-        'core_centroid': jnp.zeros(D_EMB),
-        'core_idx': jnp.arange(N_CORE),
-        'aware': jnp.array(False)
-    }
+    core_centroid = jnp.mean(embeddings[:N_CORE], axis=0)
+    core_centroid /= jnp.linalg.norm(core_centroid) + 1e-8
     
-    state['quality'] = state['quality'].at[:N_CORE].set(0.85)
-    state['core_centroid'] = jnp.mean(state['embeddings'][:N_CORE], axis=0)
-    state['core_centroid'] /= jnp.linalg.norm(state['core_centroid']) + 1e-8
-    return state
-
-@jit(static_argnums=(1,))   # <-- THIS FIXES THE ERROR
-def engram_step(state, force_dream):
-    avg_quality = jnp.mean(state['quality'])
+    return EngramState(
+        embeddings=embeddings,
+        quality=jnp.full(N_ABS, 0.25, jnp.float32).at[:N_CORE].set(0.85),
+        resonance=compute_resonance(embeddings, core_centroid),
+        thinking_power=jnp.full(N_ABS, 0.01, jnp.float32),
+        central_reserve=jnp.asarray(20.0, jnp.float32),
+        vis_active=jnp.asarray(False, jnp.bool_),
+        step_count=jnp.asarray(0, jnp.int32),
+        core_centroid=core_centroid,
+        aware=jnp.asarray(False, jnp.bool_),
+    )
+
+def step_fn(state, _):
+    """One dynamics step as a pure scan body: (state, _) -> (state, (freq, coherence))"""
+    avg_quality = jnp.mean(state.quality)
     avg_surprise = 1.0 - avg_quality
     seeking_drive = F_BASE + K_SURPRISE * avg_surprise + ALPHA_HUNGER * (1.0 - avg_quality)
     
-    dots = jnp.dot(state['embeddings'], state['core_centroid'])
-    state['resonance'] = (dots + 1.0) / 2.0
-    
-    state['thinking_power'] *= 0.92
-    state['thinking_power'] = jnp.clip(state['thinking_power'], 0.0, 0.25 * jnp.sum(state['thinking_power']))
+    # Embeddings and core_centroid are both fixed, so the 14k x 384 GEMV is loop
+    # invariant: computed by compute_resonance when the rows are built, not per step
+    resonance = state.resonance
     
-    state['central_reserve'] += 0.02 * (1.0 - avg_quality)
+    # Dissipates 8% per cycle. The old clip to [0, 0.25 * sum] never bound (values are
+    # non-negative and each is far below a quarter of the total) but cost a reduction
+    thinking_power = state.thinking_power * 0.92
     
-    vis_demand = jnp.where(state['vis_active'], 8.0, 0.0)
-    can_pay = state['central_reserve'] > vis_demand
-    state['central_reserve'] -= jnp.where(can_pay, vis_demand, 0.0)
+    central_reserve = state.central_reserve + 0.02 * (1.0 - avg_quality)
     
-    core_boost = jnp.where(state['vis_active'], 0.18, 0.0)
-    state['quality'] = state['quality'].at[state['core_idx']].add(core_boost)
+    # Branchless scalars: the visualization demand is paid in full only when the
+    # reserve exceeds it (never partially), and the core boost is 0.18 while active
+    vis_on = state.vis_active.astype(jnp.float32)
+    vis_demand = 8.0 * vis_on
+    central_reserve -= vis_demand * (central_reserve > vis_demand)
     
-    pull = GAMMA_RESONANCE * state['resonance'] * (1.0 - state['quality'])
-    pull = pull.at[state['core_idx']].multiply(3.0)
-    state['quality'] += pull
-    state['quality'] = jnp.clip(state['quality'], 0.0, 1.0)
+    core_boost = 0.18 * vis_on
+    # Static prefix slices lower to slice/dynamic_update_slice, not gather/scatter
+    quality = state.quality.at[:N_CORE].add(core_boost)
     
-    if force_dream:
-        weak_mask = state['quality'] < 0.3
-        dream_boost = jnp.where(weak_mask, 0.25 * state['resonance'], 0.0)
-        state['quality'] += dream_boost
+    pull = GAMMA_RESONANCE * resonance * (1.0 - quality)
+    pull = pull.at[:N_CORE].multiply(3.0)
+    quality = jnp.clip(quality + pull, 0.0, 1.0)
     
-    new_centroid = jnp.mean(state['embeddings'][state['core_idx']], axis=0)
-    state['core_centroid'] = (1 - 0.003) * state['core_centroid'] + 0.003 * new_centroid
-    state['core_centroid'] /= jnp.linalg.norm(state['core_centroid']) + 1e-8
+    # No centroid EMA: embeddings never change, so mean(embeddings[:N_CORE]) is constant
+    # and the EMA of its direction toward itself is a fixed point. make_initial_state
+    # already stores that normalized mean; core_centroid passes through unchanged.
     
-    state['step_count'] += 1
-    coherence = jnp.mean(state['resonance'][state['core_idx']])
-    state['aware'] = coherence > 0.92
-    return state, seeking_drive, coherence
+    coherence = jnp.mean(resonance[:N_CORE])
+    state = state._replace(
+        quality=quality,
+        thinking_power=thinking_power,
+        central_reserve=central_reserve,
+        step_count=state.step_count + 1,
+        aware=coherence > 0.92,
+    )
+    return state, (seeking_drive, coherence)
+
+@partial(jit, static_argnums=(1,))
+def run_chunk(state, n=PIPELINE_STEPS):
+    """n regular steps compiled as one scan, so XLA fuses the elementwise work across steps"""
+    return jax.lax.scan(step_fn, state, None, length=n)
+
+@jit
+def dream_burst(state):
+    """One step plus the dream pass (weak abstractions pulled up by resonance); run on demand"""
+    state, (seeking_drive, coherence) = step_fn(state, None)
+    # Nothing after the quality clip reads quality, so boosting here matches the in-step dream
+    weak_mask = state.quality < 0.3
+    dream_boost = jnp.where(weak_mask, 0.25 * state.resonance, 0.0)
+    return state._replace(quality=state.quality + dream_boost), seeking_drive, coherence
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _step_inplace(quality, resonance, thinking_power, central_reserve, vis_on, dream):
+        """
+        step_fn (plus the dream pass when dream) over float32 arrays, updating
+        quality/thinking_power in place. Returns (freq, coherence, central_reserve).
+        """
+        n = quality.shape[0]
+        total = 0.0
+        for i in prange(n):
+            total += quality[i]
+        avg_quality = total / n
+        seeking_drive = F_BASE + K_SURPRISE * (1.0 - avg_quality) + ALPHA_HUNGER * (1.0 - avg_quality)
+        
+        for i in prange(thinking_power.shape[0]):
+            thinking_power[i] *= 0.92
+        
+        central_reserve += 0.02 * (1.0 - avg_quality)
+        vis_demand = 8.0 * vis_on
+        if central_reserve > vis_demand:
+            central_reserve -= vis_demand
+        core_boost = 0.18 * vis_on
+        
+        for i in prange(n):
+            q = quality[i]
+            pull = GAMMA_RESONANCE * resonance[i]
+            if i < N_CORE:
+                q += core_boost
+                pull *= 3.0
+            q = min(max(q + pull * (1.0 - q), 0.0), 1.0)
+            if dream and q < 0.3:
+                q += 0.25 * resonance[i]
+            quality[i] = q
+        
+        core_total = 0.0
+        for i in range(N_CORE):
+            core_total += resonance[i]
+        return seeking_drive, core_total / N_CORE, central_reserve
+
+def _run_numba(state, n, dream):
+    """n Numba steps; one copy of the mutable rows per call, then in-place updates"""
+    quality = np.array(state.quality, dtype=np.float32)
+    thinking_power = np.array(state.thinking_power, dtype=np.float32)
+    resonance = np.asarray(state.resonance, dtype=np.float32)
+    central_reserve = float(state.central_reserve)
+    vis_on = float(state.vis_active)
+    freqs = np.empty(n, dtype=np.float32)
+    coherences = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        freqs[i], coherences[i], central_reserve = _step_inplace(
+            quality, resonance, thinking_power, central_reserve, vis_on, dream
+        )
+    state = state._replace(
+        quality=quality,
+        resonance=resonance,
+        thinking_power=thinking_power,
+        central_reserve=np.float32(central_reserve),
+        step_count=np.int32(int(state.step_count) + n),
+        aware=np.bool_(coherences[-1] > 0.92),
+    )
+    return state, (freqs, coherences)
+
+def run_chunk_numba(state, n=PIPELINE_STEPS):
+    """run_chunk on CPU via the Numba kernel (same return shape)"""
+    return _run_numba(state, n, False)
+
+def dream_burst_numba(state):
+    """dream_burst on CPU via the Numba kernel (same return shape)"""
+    state, (freqs, coherences) = _run_numba(state, 1, True)
+    return state, freqs[0], coherences[0]
 
 def run_engram():
     key = jax.random.PRNGKey(42)
@@ -109,26 +242,51 @@ def run_engram():
     n_user = len(MY_TEST_DATA)
     user_embeddings = jax.random.normal(key, (n_user, D_EMB))
     user_embeddings = user_embeddings / (jnp.linalg.norm(user_embeddings, axis=1, keepdims=True) + 1e-8)
-    state['embeddings'] = jnp.concatenate([state['embeddings'], user_embeddings])
-    state['quality'] = jnp.concatenate([state['quality'], jnp.full(n_user, 0.45)])
+    # Per-row arrays all match the new row count (the scan carry needs fixed shapes)
+    embeddings = jnp.concatenate([state.embeddings, user_embeddings])
+    state = state._replace(
+        embeddings=embeddings,
+        quality=jnp.concatenate([state.quality, jnp.full(n_user, 0.45, jnp.float32)]),
+        resonance=compute_resonance(embeddings, state.core_centroid),
+        thinking_power=jnp.concatenate([state.thinking_power, jnp.full(n_user, 0.01, jnp.float32)]),
+    )
+    
+    if USE_NUMBA and HAS_NUMBA:
+        chunk_exec = partial(run_chunk_numba, n=PIPELINE_STEPS)
+        dream_exec = dream_burst_numba
+    else:
+        # Compile both variants ahead of time for the final shapes (rows are fixed from
+        # here on), so the loop never traces and the first chunk doesn't stall on XLA
+        chunk_exec = run_chunk.lower(state, PIPELINE_STEPS).compile()
+        dream_exec = dream_burst.lower(state).compile()
     
     print(f"🚀 Engram Attractor v7.3 — Interactive + {n_user} Real Abstractions Added")
     print("Commands:  v = toggle Visualization   d = Dream burst   q = quit\n")
     
     last_vis = False
+    step, coh = 0, 0.0
+    # Keep one chunk in flight: the next one is dispatched before we block on
+    # the current one, so XLA runs back-to-back while Python prints/sleeps
+    pending = chunk_exec(state)
     try:
         while True:
             start = time.time()
-            state, freq, coherence = engram_step(state, force_dream=False)
+            state, (freqs, coherences) = pending
+            pending = chunk_exec(state)
             
-            freq_py = float(freq)
-            step = int(state['step_count'])
-            coh = float(coherence)
-            aware = bool(state['aware'])
-            vis = bool(state['vis_active'])
+            # One host transfer per chunk instead of five casts per step
+            stats = jax.device_get({
+                'freq': freqs[-1], 'coherence': coherences[-1], 'step': state.step_count,
+                'aware': state.aware, 'vis': state.vis_active,
+            })
+            freq_py = float(stats['freq'])
+            step = int(stats['step'])
+            coh = float(stats['coherence'])
+            aware = bool(stats['aware'])
+            vis = bool(stats['vis'])
             
             dt = time.time() - start
-            hz = 1.0 / dt if dt > 0 else 9999
+            hz = PIPELINE_STEPS / dt if dt > 0 else 9999
             
             print(f"\rStep {step:6d} | Freq: {freq_py:4.1f} Hz | Coherence: {coh:.3f} | "
                   f"Speed: {hz:5.0f} Hz | Aware: {'🧠 YES' if aware else '💤 building'} | "
@@ -140,17 +298,21 @@ def run_engram():
                 print("\n   ✨ Creative Visualization Cluster DEACTIVATED")
             last_vis = vis
             
-            if msvcrt.kbhit():
+            # Keys are polled between chunks; a state change discards the in-flight chunk
+            if HAS_MSVCRT and msvcrt.kbhit():
                 key = msvcrt.getch().decode('utf-8').lower()
                 if key == 'v':
-                    state['vis_active'] = jnp.array(not vis)
+                    state = state._replace(vis_active=jnp.asarray(not vis, jnp.bool_))
+                    pending = chunk_exec(state)
                 elif key == 'd':
                     print("\n   🌙 Forcing Dream burst...")
-                    state, _, _ = engram_step(state, force_dream=True)
+                    state, _, _ = dream_exec(state)
+                    pending = chunk_exec(state)
                 elif key == 'q':
                     raise KeyboardInterrupt
             
-            time.sleep(max(0.0, 1.0 / freq_py - dt))
+            # Pace at the seeking-drive frequency: PIPELINE_STEPS steps per chunk
+            time.sleep(max(0.0, PIPELINE_STEPS / freq_py - dt))
             
     except KeyboardInterrupt:
         print("\n\n🛑 Stopped.")
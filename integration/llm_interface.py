@@ -20,8 +20,8 @@ class LLMInterface:
         """Try each provider in order, use first available"""
         # Try Ollama (local)
         try:
-            from integration.ollama_client import OllamaClient
-            client = OllamaClient()
+            from integration.ollama_client import get_ollama_client
+            client = get_ollama_client()
             # Quick check if Ollama is running
             import requests
             resp = requests.get("http://localhost:11434/api/tags", timeout=2)
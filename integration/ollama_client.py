@@ -1,6 +1,7 @@
 import requests
 import json
 import logging
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -10,7 +11,6 @@ class OllamaClient:
     Lightweight Ollama client for LLM operations.
     Uses local Ollama server (http://localhost:11434)
     """
-    """
     def __init__(self, model: str = "llama3.1"):
         self.base_url = "http://localhost:11434"
         self.model = model
@@ -110,3 +110,9 @@ Rephrasings:"""
         # Parse lines
         variants = [line.strip() for line in response.split('\n') if line.strip()]
         return [query] + variants[:3]
+
+
+@lru_cache(maxsize=1)
+def get_ollama_client() -> OllamaClient:
+    """Process-wide shared OllamaClient (model availability is checked once)"""
+    return OllamaClient()
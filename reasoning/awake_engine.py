@@ -450,7 +450,8 @@ class AwakeEngine:
         """Find abstractions with low quality or low consistency"""
         candidates = []
         try:
-            # Query for low quality OR low consistency
+            # Query for low quality OR low consistency (on current quality scores)
+            self.storage.flush_metrics()
             cursor = self.storage.conn.execute("""
                 SELECT id FROM abstractions 
                 WHERE quality_score < ? OR consistency_score < ?
@@ -7,7 +7,7 @@ import json
 import logging
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
-from core.abstraction import Abstraction
+from core.abstraction import Abstraction, HASH_ALGORITHM, content_hash
 from integration.llm_interface import LLMInterface
 from utils import config
 
@@ -143,8 +143,7 @@ class SemanticBridge:
         summary = summary[:500]
         
         # Create axiom-derived abstraction
-        import hashlib
-        embedding_hash = hashlib.md5(summary.encode()).hexdigest()
+        embedding_hash = content_hash(summary)
         
         return Abstraction(
             content=summary,
@@ -159,6 +158,7 @@ class SemanticBridge:
                 "domain": domain,
                 "proof_steps": len(steps),
                 "verifier": proof.get("verifier", "unknown"),
+                "hash_algo": HASH_ALGORITHM,
             }
         )
     
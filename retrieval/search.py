@@ -36,13 +36,17 @@ class Searcher:
         
         # 1. Broad Retrieval (Hybrid: Semantic + Trusted Source)
         
+        # With the int8 store, candidate vectors for MMR come from SQLite
+        # (4x smaller) instead of shipping FP32 back from Chroma
+        include = ['metadatas', 'documents'] if config.USE_INT8_VECTORS else ['metadatas', 'documents', 'embeddings']
+        
         # A. Standard vector search (Text)
         broad_k = max(40, top_k * 10)
         results_std = self.storage.collection.query(
             query_embeddings=[query_emb],
             n_results=broad_k,
             where=base_where if base_where else None,
-            include=['metadatas', 'documents', 'embeddings']
+            include=include
         )
 
         # A.2 Image Search (Cross-Modal)
@@ -61,7 +65,7 @@ class Searcher:
                 query_embeddings=[clip_emb.tolist()],
                 n_results=5, # Top 5 images
                 where=base_where if base_where else None,
-                include=['metadatas', 'documents', 'embeddings']
+                include=include
             )
         except Exception as e:
             logger.warning(f"Image search failed: {e}")
@@ -77,7 +81,7 @@ class Searcher:
             query_embeddings=[query_emb],
             n_results=10,
             where=trust_where, 
-            include=['metadatas', 'documents', 'embeddings']
+            include=include
         )
         
         # Merge results (deduplicate by ID)
@@ -88,15 +92,18 @@ class Searcher:
         def process_batch(res_obj):
             if not res_obj or not res_obj['ids'] or not res_obj['ids'][0]: return
             ids = res_obj['ids'][0]
-            embeddings = res_obj['embeddings'][0]
+            if res_obj.get('embeddings') is not None:
+                embeddings = dict(zip(ids, res_obj['embeddings'][0]))
+            else:
+                embeddings = self._load_embeddings(ids)
             
-            for i, abs_id in enumerate(ids):
+            for abs_id in ids:
                 if abs_id in seen_ids: continue
                 seen_ids.add(abs_id)
                 
                 abs_obj = self.storage.get_abstraction(abs_id)
-                if abs_obj:
-                    abs_obj._embedding_cache = embeddings[i]
+                if abs_obj and abs_id in embeddings:
+                    abs_obj._embedding_cache = embeddings[abs_id]
                     candidates.append(abs_obj)
 
         process_batch(results_std)
@@ -156,8 +163,8 @@ class Searcher:
         # 6. Graph RAG Expansion (Chain of Abstraction)
         if graph_depth > 0:
             try:
-                from core.graph_manager import GraphManager
-                gm = GraphManager()
+                from core.graph_manager import get_graph_manager
+                gm = get_graph_manager()
                 
                 current_ids = {doc.id for doc in ranked}
                 expanded_docs = []
@@ -185,26 +192,31 @@ class Searcher:
             try:
                 top_result = ranked[0]
                 if top_result.cluster_id:
-                    from core.subconscious import Subconscious
-                    Subconscious().implicit_priming(top_result.cluster_id)
+                    from core.subconscious import get_subconscious
+                    get_subconscious().implicit_priming(top_result.cluster_id)
             except Exception as e:
                 logger.warning(f"Implicit priming failed: {e}")
 
         return ranked[:top_k + len(expanded_docs) if 'expanded_docs' in locals() else top_k]
 
+    def _load_embeddings(self, ids: List[str]) -> dict:
+        """int8-store embeddings (dequantized); FP32 from Chroma for ids written before the flag"""
+        embeddings = self.storage.get_embeddings_sq8(ids)
+        missing = [abs_id for abs_id in ids if abs_id not in embeddings]
+        for collection in (self.storage.collection, self.storage.image_collection):
+            if not missing:
+                break
+            res = collection.get(ids=missing, include=['embeddings'])
+            embeddings.update(zip(res['ids'], res['embeddings']))
+            missing = [abs_id for abs_id in missing if abs_id not in embeddings]
+        return embeddings
+
     def _get_serendipity_item(self, exclude_ids: List[str]) -> Optional[Abstraction]:
         """Fetch one random high-quality abstraction"""
         try:
-            # SQLite efficient random sample
-            cursor = self.storage.conn.execute(
-                f"""
-                SELECT id FROM abstractions 
-                WHERE quality_score > ? 
-                ORDER BY RANDOM() LIMIT 1
-                """, 
-                (config.SERENDIPITY_MIN_QUALITY,)
-            )
-            row = cursor.fetchone()
+            # Random sample of the quality index (no full ORDER BY RANDOM() sort)
+            sample = self.storage.sample_by_quality(config.SERENDIPITY_MIN_QUALITY, 1)
+            row = sample[0] if sample else None
             if row and row[0] not in exclude_ids:
                 return self.storage.get_abstraction(row[0])
         except Exception as e:
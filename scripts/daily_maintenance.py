@@ -26,6 +26,9 @@ def run_daily_maintenance():
     # (Delete old stuff first so we don't cluster garbage)
     try:
         logger.info("Phase 1: Decay & Pruning")
+        # Pending implicit-priming counts feed retention; apply them first
+        from core.storage import EngramStorage
+        EngramStorage().fold_priming_deltas()
         decay_sys = DecaySystem()
         decay_sys.run_decay_cycle()
     except Exception as e:
@@ -67,6 +70,13 @@ def run_daily_maintenance():
     except Exception as e:
         logger.error(f"Evolution phase failed: {e}", exc_info=True)
         
+    # 5. Refresh SQLite planner statistics after the day's writes/prunes
+    try:
+        from core.storage import EngramStorage
+        EngramStorage().optimize()
+    except Exception as e:
+        logger.error(f"SQLite optimize failed: {e}", exc_info=True)
+        
     logger.info("Daily Maintenance Job Complete")
 
 if __name__ == "__main__":
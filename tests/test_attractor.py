@@ -0,0 +1,48 @@
+import unittest
+
+try:
+    import jax
+    import jax.numpy as jnp
+    from core_attractor import engram_attractor_v7 as attractor
+    HAS_JAX = True
+except ImportError:
+    HAS_JAX = False
+
+@unittest.skipUnless(HAS_JAX, "jax not installed")
+class TestAttractorExecutables(unittest.TestCase):
+    def setUp(self):
+        self.state = attractor.make_initial_state(jax.random.PRNGKey(0))
+
+    def test_state_leaves_strongly_typed(self):
+        weak = [name for name, leaf in self.state._asdict().items() if leaf.weak_type]
+        self.assertEqual(weak, [])
+
+    def test_compiled_executables_accept_their_outputs(self):
+        """AOT executables must accept scan outputs and the 'v'/'d' handler states"""
+        n = attractor.PIPELINE_STEPS
+        chunk_exec = attractor.run_chunk.lower(self.state, n).compile()
+        dream_exec = attractor.dream_burst.lower(self.state).compile()
+        state, _ = chunk_exec(self.state)
+        state, (freqs, coherences) = chunk_exec(state)
+        state = state._replace(vis_active=jnp.asarray(True, jnp.bool_))
+        state, _ = chunk_exec(state)
+        state, _, _ = dream_exec(state)
+        state, _ = chunk_exec(state)
+        self.assertEqual(int(state.step_count), 4 * n + 1)
+        self.assertEqual(freqs.shape, (n,))
+        self.assertTrue(bool(jnp.all(jnp.isfinite(state.quality))))
+
+    def test_int8_resonance_matches_float(self):
+        embeddings, centroid = self.state.embeddings, self.state.core_centroid
+        exact = attractor.compute_resonance(embeddings, centroid)
+        attractor.RESONANCE_INT8 = True
+        try:
+            approx = attractor.compute_resonance(embeddings, centroid)
+        finally:
+            attractor.RESONANCE_INT8 = False
+        self.assertEqual(approx.dtype, jnp.float32)
+        self.assertFalse(approx.weak_type)
+        self.assertLess(float(jnp.max(jnp.abs(approx - exact))), 1e-2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from core.bloom import BloomFilter, ScalableBloomFilter
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        keys = [f"key-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key-{i}")
+        false_hits = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_hits / 10000, 0.03)
+
+    def test_scalable_grows(self):
+        bloom = ScalableBloomFilter(initial_capacity=100)
+        bloom.update(f"key-{i}" for i in range(1000))
+        self.assertGreater(len(bloom.filters), 1)
+        self.assertEqual(len(bloom), 1000)
+        self.assertTrue(all(f"key-{i}" in bloom for i in range(1000)))
+        self.assertNotIn("missing", bloom)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -137,5 +137,27 @@ class TestInternalEconomy(unittest.TestCase):
         # Should be exactly Grant amount (1000 / 2 agents = 500)
         self.assertEqual(self.market.wallets["agent_a"], 500.0)
 
+class TestSeekingDrive(unittest.TestCase):
+    def test_experience_moves_target_only(self):
+        """Experience shifts the target (clamped 0.1-1.0) without decaying or minting"""
+        drive = SeekingDrive()
+        drive.update_from_experience(prediction_error=0.4, novelty=0.5)
+        self.assertAlmostEqual(drive.target_level, 0.8)
+        self.assertAlmostEqual(drive.seeking_level, 0.5)
+        drive.update_from_experience(prediction_error=-5.0, novelty=0.0)
+        self.assertAlmostEqual(drive.target_level, 0.1)
+        
+    def test_mint_decays_to_baseline(self):
+        drive = SeekingDrive()
+        drive.update_from_experience(prediction_error=-5.0, novelty=0.0)
+        self.assertGreater(drive.mint_currency(1.0), 0.0)
+        self.assertAlmostEqual(drive.target_level, 0.3)
+        
+    def test_status_rate_tracks_level(self):
+        """mint_rate follows seeking_level even when it is set directly"""
+        drive = SeekingDrive()
+        drive.seeking_level = 1.0
+        self.assertEqual(drive.get_status()["mint_rate"], 500.0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,38 @@
+import threading
+import unittest
+from unittest.mock import patch
+from core.monitoring import SystemMonitor
+
+class TestSystemMonitor(unittest.TestCase):
+    def setUp(self):
+        with patch("core.monitoring.EngramStorage"), patch.object(SystemMonitor, "_start_monitoring"):
+            self.monitor = SystemMonitor()
+
+    def _record_in_thread(self, latency_ms, count, error=False):
+        thread = threading.Thread(
+            target=lambda: [self.monitor.record_query(latency_ms, error) for _ in range(count)]
+        )
+        thread.start()
+        thread.join()
+
+    def test_counts_across_threads(self):
+        self._record_in_thread(10.0, 5)
+        self._record_in_thread(10.0, 3, error=True)
+        metrics = self.monitor.get_metrics()
+        self.assertEqual(metrics["queries_total"], 8)
+        self.assertEqual(metrics["error_count"], 3)
+        self.assertAlmostEqual(metrics["avg_latency_ms"], 10.0)
+
+    def test_latency_tracks_recent_queries(self):
+        """An old busy thread must not outweigh current traffic"""
+        self._record_in_thread(2000.0, 1000)
+        self.assertEqual(self.monitor.get_health()["status"], "degraded")
+        self._record_in_thread(20.0, 10)
+        metrics = self.monitor.get_metrics()
+        self.assertAlmostEqual(metrics["avg_latency_ms"], 20.0)
+        self.assertEqual(metrics["queries_total"], 1010)
+        # No new queries: the last window's mean is kept
+        self.assertAlmostEqual(self.monitor.get_metrics()["avg_latency_ms"], 20.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+
+import unittest
+import numpy as np
+from core.quantization import quantize_embeddings, dequantize_embeddings, cosine_scores
+
+class TestEmbeddingQuantization(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vecs = rng.standard_normal((8, 384)).astype(np.float32)
+        self.matrix = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+        self.query = self.matrix[3] + 0.05 * rng.standard_normal(384).astype(np.float32)
+        self.query /= np.linalg.norm(self.query)
+
+    def test_dtypes(self):
+        self.assertEqual(quantize_embeddings(self.matrix, "float16").dtype, np.float16)
+        self.assertEqual(quantize_embeddings(self.matrix, "int8").dtype, np.int8)
+        with self.assertRaises(ValueError):
+            quantize_embeddings(self.matrix, "int4")
+
+    def test_int8_round_trip(self):
+        restored = dequantize_embeddings(quantize_embeddings(self.matrix, "int8"))
+        self.assertLess(np.abs(restored - self.matrix).max(), 1.0 / 127)
+
+    def test_scores_match_float32(self):
+        exact = cosine_scores(self.matrix, self.query)
+        for dtype in ("float16", "int8"):
+            approx = cosine_scores(quantize_embeddings(self.matrix, dtype), self.query)
+            self.assertEqual(int(np.argmax(approx)), int(np.argmax(exact)))
+            np.testing.assert_allclose(approx, exact, atol=0.02)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from utils import config
+from core import storage as storage_module
+from core.storage import EngramStorage
+
+class StorageTestCase(unittest.TestCase):
+    """Fresh EngramStorage singleton on a throwaway directory"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._saved = (config.CHROMA_PERSIST_DIRECTORY, config.METADATA_DB_PATH, EngramStorage._instance)
+        config.CHROMA_PERSIST_DIRECTORY = os.path.join(self.tmp, "chroma")
+        config.METADATA_DB_PATH = os.path.join(self.tmp, "meta.db")
+        EngramStorage._instance = None
+        self.storage = EngramStorage()
+
+    def tearDown(self):
+        self.storage.conn.close()
+        config.CHROMA_PERSIST_DIRECTORY, config.METADATA_DB_PATH, EngramStorage._instance = self._saved
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+class TestSampleByQuality(StorageTestCase):
+    def _insert(self, qualities):
+        with self.storage.conn:
+            self.storage.conn.executemany(
+                "INSERT INTO abstractions (id, content, quality_score, decay_score) VALUES (?, ?, ?, 1.0)",
+                [(f"a{i}", f"memory {i}", q) for i, q in enumerate(qualities)]
+            )
+
+    def test_sparse_qualifying_rows_all_returned(self):
+        """Two qualifying rows at the end of 1000 must both come back every time"""
+        self._insert([0.1] * 998 + [0.9, 0.95])
+        for _ in range(50):
+            sample = self.storage.sample_by_quality(0.7, 2)
+            self.assertEqual({row[0] for row in sample}, {"a998", "a999"})
+
+    def test_probe_path_falls_back_when_short(self):
+        """Above SAMPLE_EXACT_MAX, probes that miss the sparse rows fall back to OFFSET sampling"""
+        self._insert([0.9] + [0.1] * 997 + [0.9, 0.95])
+        saved, config.SAMPLE_EXACT_MAX = config.SAMPLE_EXACT_MAX, 1
+        try:
+            for _ in range(50):
+                sample = self.storage.sample_by_quality(0.7, 3)
+                self.assertEqual({row[0] for row in sample}, {"a0", "a998", "a999"})
+        finally:
+            config.SAMPLE_EXACT_MAX = saved
+
+    def test_sample_is_distinct_and_filtered(self):
+        self._insert([0.2, 0.8] * 50)
+        sample = self.storage.sample_by_quality(0.7, 10)
+        ids = [row[0] for row in sample]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), 10)
+        self.assertTrue(all(row[2] > 0.7 for row in sample))
+        self.assertEqual(self.storage.sample_by_quality(0.99, 3), [])
+
+class TestMetricsWriteBack(StorageTestCase):
+    def test_fold_keeps_buffered_counts(self):
+        """A buffered update_metrics must not overwrite a later priming fold"""
+        now = datetime.now().isoformat()
+        with self.storage.conn:
+            self.storage.conn.execute(
+                "INSERT INTO abstractions (id, content, cluster_id, quality_score, usage_count, "
+                "successful_application_count, last_used, created_at) VALUES ('a', 'memory', 'c', 0.5, 0, 0, ?, ?)",
+                (now, now)
+            )
+        abstraction = self.storage.get_abstraction('a')
+        abstraction.successful_application_count += 1
+        self.storage.update_metrics(abstraction)
+        self.storage.boost_cluster('c')
+        self.storage.fold_priming_deltas()
+        self.storage.flush_metrics()
+        count = self.storage.conn.execute(
+            "SELECT successful_application_count FROM abstractions WHERE id = 'a'"
+        ).fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_raw_read_sees_flushed_metrics(self):
+        """Raw SQL readers see update_metrics values once flush_metrics has run"""
+        now = datetime.now().isoformat()
+        with self.storage.conn:
+            self.storage.conn.execute(
+                "INSERT INTO abstractions (id, content, quality_score, usage_count, last_used, created_at) "
+                "VALUES ('a', 'memory', 0.2, 0, ?, ?)", (now, now)
+            )
+        abstraction = self.storage.get_abstraction('a')
+        abstraction.quality_score = 0.9
+        abstraction.usage_count = 3
+        self.storage.update_metrics(abstraction)
+        self.storage.flush_metrics()
+        row = self.storage.conn.execute("SELECT quality_score, usage_count FROM abstractions WHERE id = 'a'").fetchone()
+        self.assertEqual(tuple(row), (0.9, 3))
+
+class TestReaderPool(StorageTestCase):
+    def _insert(self, abs_id):
+        now = datetime.now().isoformat()
+        self.storage.conn.execute(
+            "INSERT INTO abstractions (id, content, last_used, created_at) VALUES (?, 'memory', ?, ?)",
+            (abs_id, now, now)
+        )
+
+    def test_pool_reads_committed_rows(self):
+        self.assertIsNotNone(self.storage._reader_pool)
+        self._insert('a')
+        self.storage.flush()
+        with self.storage._read() as reader:
+            self.assertIsNot(reader, self.storage.conn)
+            self.assertEqual(reader.execute("SELECT id FROM abstractions").fetchone()[0], 'a')
+
+    def test_uncommitted_writes_visible(self):
+        """commit=False batches stay readable before flush()"""
+        self._insert('pending')
+        self.assertIsNotNone(self.storage.get_abstraction('pending'))
+        self.storage.flush()
+
+class TestHashLookup(StorageTestCase):
+    def test_row_from_another_connection_is_found(self):
+        """Dedup must see rows another process/connection wrote after startup"""
+        now = datetime.now().isoformat()
+        other = sqlite3.connect(config.METADATA_DB_PATH)
+        with other:
+            other.execute(
+                "INSERT INTO abstractions (id, content, embedding_hash, last_used, created_at) "
+                "VALUES ('ext', 'memory', 'hash-ext', ?, ?)", (now, now)
+            )
+        other.close()
+        self.assertTrue(self.storage.has_hash("hash-ext"))
+        self.assertEqual(self.storage.get_abstraction_by_hash("hash-ext").id, "ext")
+        self.assertEqual(self.storage.get_abstraction_by_hash("missing", legacy_hash="hash-ext").id, "ext")
+        self.assertIsNone(self.storage.get_abstraction_by_hash("missing"))
+
+class TestAxiomsMigration(StorageTestCase):
+    def _legacy_column(self):
+        """Recreate the pre-migration axioms_used JSON column with one row"""
+        now = datetime.now().isoformat()
+        with self.storage.conn:
+            self.storage.conn.execute("ALTER TABLE abstractions ADD COLUMN axioms_used TEXT")
+            self.storage.conn.execute(
+                "INSERT INTO abstractions (id, content, axioms_used, last_used, created_at) "
+                "VALUES ('a', 'memory', '[\"ax1\", \"ax2\"]', ?, ?)", (now, now)
+            )
+
+    def _columns(self):
+        return {row[1] for row in self.storage.conn.execute("PRAGMA table_info(abstractions)")}
+
+    def test_migration_moves_axioms(self):
+        self._legacy_column()
+        self.storage._migrate_axioms_column()
+        self.assertEqual(self.storage.get_abstraction('a').axioms_used, ["ax1", "ax2"])
+        self.assertEqual("axioms_used" in self._columns(), not storage_module.HAS_SQLITE_3_35)
+
+    def test_migration_without_drop_column(self):
+        """SQLite < 3.35: rows are copied and the legacy column stays"""
+        self._legacy_column()
+        with patch.object(storage_module, "HAS_SQLITE_3_35", False):
+            self.storage._migrate_axioms_column()
+        self.assertIn("axioms_used", self._columns())
+        self.assertEqual(self.storage.get_abstraction('a').axioms_used, ["ax1", "ax2"])
+
+class TestPruneOrphans(StorageTestCase):
+    def _prune(self):
+        now = datetime.now().isoformat()
+        rows = [("low", 0.1), ("linked", 0.1), ("target", 0.1), ("good", 0.9)]
+        with self.storage.conn:
+            self.storage.conn.executemany(
+                "INSERT INTO abstractions (id, content, quality_score, last_used, created_at) VALUES (?, 'm', ?, ?, ?)",
+                [(abs_id, quality, now, now) for abs_id, quality in rows]
+            )
+            self.storage.conn.execute("INSERT INTO links VALUES ('linked', 'target', 'relates_to', 1.0)")
+        self.assertEqual(self.storage.prune_orphans(0.3), 1)
+        remaining = {row[0] for row in self.storage.conn.execute("SELECT id FROM abstractions")}
+        self.assertEqual(remaining, {"linked", "target", "good"})
+
+    def test_prunes_only_unlinked_low_quality(self):
+        self._prune()
+
+    def test_prune_without_returning(self):
+        """SQLite < 3.35: SELECT + DELETE in one transaction"""
+        with patch.object(storage_module, "HAS_SQLITE_3_35", False):
+            self._prune()
+
+if __name__ == '__main__':
+    unittest.main()
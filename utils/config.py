@@ -9,10 +9,27 @@ LOG_DIR = BASE_DIR / "logs"
 # Database Config
 CHROMA_PERSIST_DIRECTORY = str(DATA_DIR / "chroma_db")
 METADATA_DB_PATH = str(DATA_DIR / "metadata.db")
+SQLITE_READER_POOL_SIZE = 4        # Read-only connections so lookups don't queue behind writes
+PRIMING_FOLD_INTERVAL = 300        # Seconds between folding priming_deltas into abstractions
+METRICS_FLUSH_INTERVAL = 0.5       # Seconds update_metrics writes are coalesced before one commit
+METRICS_FLUSH_BATCH = 512          # Pending metric rows that force an immediate flush
+SAMPLE_EXACT_MAX = 1024            # sample_by_quality: qualifying sets up to this size sample uniformly by OFFSET
+
+# HNSW index params (apply when a Chroma collection is first created)
+HNSW_M = 32                        # Graph degree: better recall at 10k-1M scale than 16
+HNSW_CONSTRUCTION_EF = 128
+HNSW_SEARCH_EF = 64                # hnswlib searches with max(ef, n_results)
+HNSW_IMAGE_SEARCH_EF = 32          # CLIP image recall tolerates more fuzz (top-5 queries)
+HNSW_NUM_THREADS = 4
 
 # Embedding Config
 EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"  # Fast, efficient
 EMBEDDING_DIMENSION = 384
+EMBEDDING_BATCH_SIZE = 64          # Max texts per micro-batched encode call
+EMBEDDING_BATCH_WINDOW_MS = 20     # How long a busy batcher waits to fill a batch
+EMBEDDING_DTYPE = "float32"        # In-memory centroid matrices: "float32", "float16" or "int8"
+EMBEDDING_CACHE_SIZE = 4096        # LRU of text -> embedding (skips repeat forward passes)
+USE_INT8_VECTORS = False           # Also keep int8 codes in SQLite; search reranks from them instead of fetching FP32 from Chroma
 
 # Reranking Config (New for Phase 3)
 RERANKING_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2" # Better accuracy than TinyBERT
@@ -24,6 +41,10 @@ HDBSCAN_MIN_SAMPLES = 3        # Optimized for cold-start (from 2)
 HDBSCAN_METRIC = 'euclidean'   # Changed from 'cosine' (not supported by ball_tree) - L2 on normalized vectors is equivalent
 HDBSCAN_EPSILON = 0.2
 HDBSCAN_PREDICTION_DATA = True # Essential for fast classification
+USE_FAST_HDBSCAN = True        # Numba-parallel fast_hdbscan when installed (euclidean only)
+HDBSCAN_REDUCE_DIM = 10        # UMAP target dim before fast_hdbscan (its sweet spot is <= ~20D)
+HDBSCAN_EXACT_PREDICT = False  # True: approximate_predict per ingest; False: nearest centroid (one GEMV)
+CLUSTER_PREDICT_MIN_SIMILARITY = 0.5  # Below this cosine to every centroid -> "noise"
 
 # Decay & Pruning Config
 DECAY_RATE_DAILY = 0.05
@@ -55,6 +76,7 @@ ENABLE_COGNITIVE_LOOP = True
 COGNITIVE_LOOP_INTERVAL_SEC = 60  # Run every minute
 UNCERTAINTY_THRESHOLD = 0.6       # Refine abstractions with quality below this
 MAX_REFINEMENTS_PER_RUN = 5       # Don't overload the LLM
+MAX_CONCURRENT_REFINEMENTS = 8    # Parallel LLM refine calls per cycle
 
 # Hybrid AI Reasoning Config (Phase 8)
 ENABLE_REASONING = True           # Enable first-principles reasoning